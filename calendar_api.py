@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Calendar Query API
+Local HTTP API over the merged Indian national days, Maharaj days, UN days and
+scraped Drik Panchang events, with cached gzip responses, strong ETags and
+cursor pagination
+
+    GET /events?from=03-01&to=03-31&source=indian,maharaj&type=appearance&q=day&limit=50
+"""
+
+import argparse
+import base64
+import bisect
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Process, Queue
+from urllib.parse import parse_qs, urlparse
+
+from planner import SOURCE_FILES, SOURCES, source_records
+
+DEFAULT_TYPES = {'iskcon': 'festival', 'indian': 'national', 'un': 'international'}
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+class QueryError(ValueError):
+    pass
+
+
+def _parse_bound(value, name):
+    """'YYYY-MM-DD' or 'MM-DD' -> (year or None, month, day)"""
+    match = re.fullmatch(r'(?:(\d{4})-)?(\d{1,2})-(\d{1,2})', value)
+    if not match:
+        raise QueryError(f"'{name}' must be YYYY-MM-DD or MM-DD")
+    year, month, day = match.groups()
+    if not 1 <= int(month) <= 12 or not 1 <= int(day) <= 31:
+        raise QueryError(f"'{name}' is not a valid date")
+    return (int(year) if year else None), int(month), int(day)
+
+
+def _accepts_gzip(accept_encoding):
+    """Whether an Accept-Encoding header allows gzip, honouring q-values ('gzip;q=0' refuses it)"""
+    qualities = {}
+    for item in accept_encoding.split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    quality = qualities.get('gzip', qualities.get('x-gzip', qualities.get('*', 0.0)))
+    return quality > 0
+
+
+class CalendarIndex:
+    """Snapshot of the calendar data; never modified once built, reload() returns a new one"""
+
+    def __init__(self, data_dir='.', version=1):
+        self.data_dir = data_dir
+        self.version = version
+        # Taken before reading, so a file written during the load triggers another reload
+        self._signature = self.signature()
+        self.events = self._load()
+        self.keys = [e['month'] * 100 + e['day'] for e in self.events]
+        self._search = [e['name'].lower() for e in self.events]
+        print(f"Indexed {len(self.events)} events (version {self.version})")
+
+    def _files(self):
+        files = {source: [os.path.join(self.data_dir, SOURCE_FILES[source])]
+                 for source in SOURCES if source != 'iskcon'}
+        files['iskcon'] = sorted(glob.glob(os.path.join(self.data_dir, 'iskcon_events_*.json')))
+        return files
+
+    def signature(self):
+        signature = []
+        for paths in self._files().values():
+            for path in paths:
+                try:
+                    signature.append((path, os.stat(path).st_mtime_ns))
+                except FileNotFoundError:
+                    pass
+        return tuple(signature)
+
+    def reload(self):
+        return CalendarIndex(self.data_dir, self.version + 1)
+
+    def _load(self):
+        """Events from the JSON files, sorted by (month, day)"""
+        events = []
+        seen = set()
+
+        def add(source, month, day, date, name, event_type, year=None):
+            # Same rule as the seenEvents Set in index.html, applied once per load
+            key = (source, year, month, day, name)
+            if day is None or not name or key in seen:
+                return
+            seen.add(key)
+            event = {'source': source, 'type': event_type, 'date': date,
+                     'month': month, 'day': day, 'name': name}
+            if year:
+                event['year'] = year
+            events.append(event)
+
+        for source, paths in self._files().items():
+            for path in paths:
+                if not os.path.exists(path):
+                    continue
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                for month, day, year, name, event in source_records(source, data):
+                    add(source, month, day, event['date'], name, event.get('type') or DEFAULT_TYPES[source], year)
+
+        events.sort(key=lambda e: (e['month'], e['day'], e.get('year', 0), SOURCES.index(e['source']), e['name']))
+        return events
+
+    def changed(self):
+        return self.signature() != self._signature
+
+    def query(self, start=None, end=None, sources=None, event_type=None, text=None):
+        """Indices of matching events, in index order"""
+        start_key = start[1] * 100 + start[2] if start else 0
+        end_key = end[1] * 100 + end[2] if end else 1231
+        spans_year = (start and end and start[0] and end[0] and
+                      (end[0] - start[0] > 1 or (end[0] > start[0] and start_key <= end_key)))
+        if spans_year:
+            ranges = [(0, 1231)]
+        elif start_key <= end_key:
+            ranges = [(start_key, end_key)]
+        else:
+            # MM-DD ranges may wrap around the new year, e.g. 12-20 to 01-10
+            ranges = [(start_key, 1231), (0, end_key)]
+
+        start_date = start if start and start[0] else None
+        end_date = end if end and end[0] else None
+        text = text.lower() if text else None
+
+        matches = []
+        for low, high in ranges:
+            first = bisect.bisect_left(self.keys, low)
+            last = bisect.bisect_right(self.keys, high)
+            for i in range(first, last):
+                event = self.events[i]
+                if sources and event['source'] not in sources:
+                    continue
+                if event_type and event['type'] != event_type:
+                    continue
+                if text and text not in self._search[i]:
+                    continue
+                year = event.get('year')
+                if year and start_date and (year, event['month'], event['day']) < start_date:
+                    continue
+                if year and end_date and (year, event['month'], event['day']) > end_date:
+                    continue
+                matches.append(i)
+        return matches
+
+
+class ResponseCache:
+    """LRU of pre-serialized responses: key -> (etag, body, gzipped body)"""
+
+    def __init__(self, size=2048):
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, body):
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        entry = (etag, body, gzip.compress(body, compresslevel=6))
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class CalendarAPI:
+    def __init__(self, data_dir='.', reload_interval=1.0):
+        self.index = CalendarIndex(data_dir)
+        self.cache = ResponseCache()
+        self.reload_interval = reload_interval
+        self._last_check = time.monotonic()
+        self._reload_lock = threading.Lock()
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        with self._reload_lock:
+            if now - self._last_check < self.reload_interval:
+                return
+            self._last_check = now
+            if self.index.changed():
+                # One reference swap; requests in flight keep the snapshot they started with
+                self.index = self.index.reload()
+                self.cache.clear()
+
+    @staticmethod
+    def _cursor(index, offset):
+        raw = f'{index.version}:{offset}'.encode('ascii')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def _offset(index, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            version, offset = base64.urlsafe_b64decode(padded).decode('ascii').split(':')
+            version, offset = int(version), int(offset)
+        except (ValueError, UnicodeDecodeError):
+            raise QueryError("invalid cursor")
+        if offset < 0:
+            raise QueryError("invalid cursor")
+        if version != index.version:
+            raise QueryError("cursor is from an older version of the data, restart the listing")
+        return offset
+
+    def events(self, params):
+        """Cached (etag, body, gzipped body) for a /events query"""
+        self._maybe_reload()
+        index = self.index
+
+        def single(name):
+            values = params.get(name)
+            return values[-1].strip() if values and values[-1].strip() else None
+
+        sources = single('source')
+        sources = tuple(sorted({s.strip() for s in sources.split(',') if s.strip()})) if sources else ()
+        unknown = set(sources) - set(SOURCES)
+        if unknown:
+            raise QueryError(f"unknown source: {', '.join(sorted(unknown))}")
+        start = _parse_bound(single('from'), 'from') if single('from') else None
+        end = _parse_bound(single('to'), 'to') if single('to') else None
+        event_type = single('type')
+        text = single('q')
+        cursor = single('cursor')
+        try:
+            limit = min(max(int(single('limit') or DEFAULT_LIMIT), 1), MAX_LIMIT)
+        except ValueError:
+            raise QueryError("'limit' must be a number")
+
+        key = (index.version, start, end, sources, event_type, text and text.lower(), cursor, limit)
+        entry = self.cache.get(key)
+        if entry:
+            return entry
+
+        offset = self._offset(index, cursor) if cursor else 0
+        matches = index.query(start, end, sources, event_type, text)
+        page = matches[offset:offset + limit]
+        next_offset = offset + limit
+        body = json.dumps({
+            'events': [index.events[i] for i in page],
+            'count': len(page),
+            'total': len(matches),
+            'next_cursor': self._cursor(index, next_offset) if next_offset < len(matches) else None
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return self.cache.put(key, body)
+
+
+def make_handler(api):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Send headers and body in one segment instead of tripping over delayed ACKs
+        wbufsize = 1 << 16
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != '/events':
+                return self._send(404, b'{"error":"not found"}')
+            try:
+                etag, body, gzipped = api.events(parse_qs(url.query))
+            except QueryError as e:
+                return self._send(400, json.dumps({'error': str(e)}).encode('utf-8'))
+
+            use_gzip = _accepts_gzip(self.headers.get('Accept-Encoding', ''))
+            variant_etag = etag[:-1] + '-gz"' if use_gzip else etag
+            if_none_match = self.headers.get('If-None-Match', '')
+            if if_none_match.strip() == '*' or variant_etag in [tag.strip() for tag in if_none_match.split(',')]:
+                return self._send(304, b'', variant_etag)
+            self._send(200, gzipped if use_gzip else body, variant_etag, 'gzip' if use_gzip else None)
+
+        def _send(self, status, body, etag=None, encoding=None):
+            self.send_response(status)
+            if status != 304:
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Vary', 'Accept-Encoding')
+            if etag:
+                self.send_header('ETag', etag)
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(api, host='127.0.0.1', port=8000):
+    server = ThreadingHTTPServer((host, port), make_handler(api))
+    server.daemon_threads = True
+    return server
+
+
+QUERIES = [
+    '/events?from=01-01&to=01-31',
+    '/events?source=maharaj&type=appearance',
+    '/events?source=indian,un&q=day&limit=20',
+    '/events?from=12-20&to=01-10',
+    '/events?q=world',
+    '/events',
+]
+
+
+def _load_client(port, duration, results, conditional):
+    import http.client
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    etags = {}
+    latencies = []
+    statuses = {}
+    deadline = time.perf_counter() + duration
+    i = 0
+    while time.perf_counter() < deadline:
+        path = QUERIES[i % len(QUERIES)]
+        i += 1
+        headers = {'Accept-Encoding': 'gzip'}
+        if conditional and path in etags:
+            headers['If-None-Match'] = etags[path]
+        start = time.perf_counter()
+        conn.request('GET', path, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status] = statuses.get(response.status, 0) + 1
+        etags[path] = response.getheader('ETag')
+    conn.close()
+    results.put((latencies, statuses))
+
+
+def benchmark(data_dir='.', clients=4, duration=5.0, conditional=False):
+    """Sustained requests per second against a single server process"""
+    from load_test import percentile
+
+    api = CalendarAPI(data_dir)
+    server = serve(api, port=0)
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    # Clients run in their own processes so they do not share the server's GIL
+    results = Queue()
+    workers = [Process(target=_load_client, args=(port, duration, results, conditional))
+               for _ in range(clients)]
+    for worker in workers:
+        worker.start()
+    collected = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    server.shutdown()
+    server.server_close()
+
+    latencies = sorted(latency for client_latencies, _ in collected for latency in client_latencies)
+    statuses = {}
+    for _, client_statuses in collected:
+        for status, count in client_statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+
+    print("\n" + "="*60)
+    print(f"API LOAD TEST ({clients} keep-alive clients, {duration:.0f}s, "
+          f"{'conditional' if conditional else 'full'} requests)")
+    print("="*60)
+    print(f"{'Requests':18}: {len(latencies)} " +
+          ' '.join(f"[{status}: {count}]" for status, count in sorted(statuses.items())))
+    print(f"{'Throughput':18}: {len(latencies) / duration:.0f} req/s")
+    for pct in (50, 95, 99):
+        print(f"{f'p{pct} latency':18}: {percentile(latencies, pct) * 1000:.2f} ms")
+    print("="*60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the merged calendar data over HTTP')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--data-dir', default='.')
+    parser.add_argument('--benchmark', action='store_true', help='Run the load test instead of serving')
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--conditional', action='store_true', help='Load test with If-None-Match revalidation')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.data_dir, args.clients, args.duration, args.conditional)
+        return
+
+    server = serve(CalendarAPI(args.data_dir), args.host, args.port)
+    print(f"Serving on http://{args.host}:{args.port}/events")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped")
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
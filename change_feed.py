@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Change Feed
+Diffs a freshly scraped dataset against the JSON it is about to replace and appends
+added / removed / renamed / shifted events to an append-only JSON-lines log,
+so consumers can sync incrementally instead of re-importing whole files
+"""
+
+import argparse
+import fcntl
+import json
+import os
+from collections import defaultdict
+from datetime import datetime
+
+CHANGE_LOG = 'change_log.jsonl'
+
+
+def _flatten(data):
+    """Turn a month-keyed (or plain list) dataset into (month, date, name, event) records"""
+    if isinstance(data, dict):
+        items = ((str(month), event) for month, events in data.items() for event in events)
+    else:
+        items = (('', event) for event in data or [])
+
+    records = []
+    for month, event in items:
+        name = event.get('event') or event.get('name') or ''
+        records.append((month, event.get('date', ''), name, event))
+    return records
+
+
+def diff_events(previous, current):
+    """Keyed diff between two datasets.
+
+    Events are matched by name first: a name whose date moved is a shift.
+    Whatever is left unmatched on the same month and date is paired up as a
+    rename, and the remainder are plain additions and removals.
+    """
+    old_by_name = defaultdict(list)
+    for record in _flatten(previous):
+        old_by_name[record[2]].append(record)
+    new_by_name = defaultdict(list)
+    for record in _flatten(current):
+        new_by_name[record[2]].append(record)
+
+    changes = []
+    removed = []
+    added = []
+
+    for name in old_by_name.keys() | new_by_name.keys():
+        old_records = old_by_name.get(name, [])
+        new_records = new_by_name.get(name, [])
+        # Exact (month, date) matches are unchanged
+        new_slots = defaultdict(list)
+        for record in new_records:
+            new_slots[record[:2]].append(record)
+        leftover_old = []
+        for record in old_records:
+            if new_slots[record[:2]]:
+                new_slots[record[:2]].pop()
+            else:
+                leftover_old.append(record)
+        leftover_new = [record for slot in new_slots.values() for record in slot]
+
+        for before, after in zip(leftover_old, leftover_new):
+            changes.append(('shifted', name, before[3], after[3]))
+        removed.extend(leftover_old[len(leftover_new):])
+        added.extend(leftover_new[len(leftover_old):])
+
+    added_by_slot = defaultdict(list)
+    for record in added:
+        added_by_slot[record[:2]].append(record)
+    for record in removed:
+        slot = added_by_slot.get(record[:2])
+        if slot:
+            after = slot.pop(0)
+            changes.append(('renamed', after[2], record[3], after[3]))
+        else:
+            changes.append(('removed', record[2], record[3], None))
+    for slot in added_by_slot.values():
+        for record in slot:
+            changes.append(('added', record[2], None, record[3]))
+
+    return changes
+
+
+def _last_sequence(log_path):
+    """Sequence number of the last line in the log, read from the end of the file"""
+    if not os.path.exists(log_path) or os.path.getsize(log_path) == 0:
+        return 0
+    with open(log_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        chunk = b''
+        while position > 0:
+            step = min(4096, position)
+            position -= step
+            f.seek(position)
+            chunk = f.read(step) + chunk
+            lines = chunk.rstrip(b'\n').split(b'\n')
+            if len(lines) > 1 or position == 0:
+                return json.loads(lines[-1])['seq']
+    return 0
+
+
+def _read_snapshot(filename):
+    """Dataset currently saved at ``filename``: {} if there is none yet, None if it cannot be parsed"""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        # A truncated or hand-edited file must not block every later save
+        print(f"Warning: could not read previous {filename} ({e}); logging a full reload instead of a diff")
+        return None
+
+
+def _write_atomic(filename, data):
+    """Write ``data`` as JSON next to ``filename`` and rename it into place"""
+    tmp_path = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def save_snapshot(filename, current, log_path=None):
+    """Replace the JSON at ``filename`` with ``current`` and append what changed to the log next to it.
+
+    The snapshot is renamed into place before the log is written, both under the log lock,
+    so a failed write logs nothing and the next run diffs against the same baseline.
+    Returns the logged entries.
+    """
+    source = os.path.splitext(os.path.basename(filename))[0]
+    log_path = log_path or os.path.join(os.path.dirname(filename), CHANGE_LOG)
+    timestamp = datetime.now().isoformat(timespec='seconds')
+
+    with open(log_path, 'a', encoding='utf-8') as log:
+        # Every scraper appends to the same log; hold the lock from reading the last seq to the append
+        fcntl.flock(log, fcntl.LOCK_EX)
+        previous = _read_snapshot(filename)
+        _write_atomic(filename, current)
+
+        if previous is None:
+            # No usable baseline: consumers should re-import the whole file
+            changes = [('reload', None, None, None)]
+        else:
+            changes = sorted(diff_events(previous, current), key=lambda change: (change[0], change[1]))
+        if not changes:
+            return []
+
+        seq = _last_sequence(log_path)
+        entries = []
+        for op, key, before, after in changes:
+            seq += 1
+            entries.append({
+                'seq': seq,
+                'ts': timestamp,
+                'source': source,
+                'op': op,
+                'key': key,
+                'before': before,
+                'after': after
+            })
+        log.write(''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries))
+        log.flush()
+
+    print(f"Logged {len(entries)} changes for {source} to {log_path}")
+    return entries
+
+
+def read_changes(since=0, log_path=CHANGE_LOG, source=None):
+    """Yield log entries with a sequence number above ``since``"""
+    if not os.path.exists(log_path):
+        return
+    with open(log_path, 'r', encoding='utf-8') as log:
+        for line in log:
+            entry = json.loads(line)
+            if entry['seq'] > since and (source is None or entry['source'] == source):
+                yield entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print calendar changes after a sequence number')
+    parser.add_argument('--since', type=int, default=0)
+    parser.add_argument('--source', help='Only show changes for this dataset, e.g. iskcon_maharaj_days')
+    parser.add_argument('--log', default=CHANGE_LOG)
+    args = parser.parse_args()
+
+    for entry in read_changes(args.since, args.log, args.source):
+        print(json.dumps(entry, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Crawl Frontier
+SQLite-backed queue of (source, year, month, location) scrape units with
+leasing, so backfills can run in several processes and resume after a crash.
+The default WAL journal only works for processes on one machine; pass --shared
+when the file lives on a network filesystem used by several machines
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import time
+from datetime import datetime
+from multiprocessing import Process
+
+from scrape_panchang import fetch_page, extract_events
+from scrape_indian_national_days import IndianNationalDaysScraper
+from scrape_un_days import scrape_un_days
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    month TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT 'pending',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    events TEXT,
+    updated REAL,
+    UNIQUE (source, year, month, location)
+);
+CREATE INDEX IF NOT EXISTS units_status ON units (status, lease_expires);
+"""
+
+SOURCES = ('drikpanchang', 'careerpower', 'un')
+# Sources that only serve the current year's page
+YEARLESS_SOURCES = ('careerpower', 'un')
+
+
+def _fetch_drikpanchang(year, month, location):
+    events = extract_events(fetch_page(year, location or None), verbose=False)
+    if not events:
+        # A block page or changed markup, not an empty calendar; leave the unit for a retry
+        raise RuntimeError("Page has no dpEventInfo events")
+    return events
+
+
+def _fetch_careerpower(year, month, location):
+    scraper = IndianNationalDaysScraper()
+    return scraper.parse_month(scraper.fetch_month(month), month)
+
+
+def _fetch_un(year, month, location):
+    events_by_month = scrape_un_days()
+    if not events_by_month:
+        raise RuntimeError("UN observances page returned no events")
+    return [event for month_num in sorted(events_by_month) for event in events_by_month[month_num]]
+
+
+HANDLERS = {
+    'drikpanchang': _fetch_drikpanchang,
+    'careerpower': _fetch_careerpower,
+    'un': _fetch_un,
+}
+
+
+class CrawlFrontier:
+    def __init__(self, path='crawl_frontier.db', lease_seconds=300, max_attempts=3, shared=False):
+        """``shared`` uses the rollback journal, since WAL needs shared memory on a single host"""
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(f"PRAGMA journal_mode={'DELETE' if shared else 'WAL'}")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def seed(self, source, years, months=('',), locations=('',)):
+        """Add units that are not already in the frontier; returns how many were new"""
+        current_year = datetime.now().year
+        if source in YEARLESS_SOURCES and list(years) != [current_year]:
+            raise ValueError(f"{source} only serves the current page; seed it for {current_year} alone")
+        rows = [(source, year, month, location)
+                for year in years for month in months for location in locations]
+        before = self.conn.total_changes
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO units (source, year, month, location, updated) "
+            "VALUES (?, ?, ?, ?, strftime('%s', 'now'))",
+            rows
+        )
+        return self.conn.total_changes - before
+
+    def lease(self, owner, limit=1):
+        """Claim up to ``limit`` pending or expired units for ``owner``"""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # A unit whose workers keep dying without calling fail() must not be reclaimed forever
+            self.conn.execute(
+                "UPDATE units SET status = 'failed', lease_owner = NULL, lease_expires = NULL, "
+                "last_error = 'lease expired on every attempt', updated = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            rows = self.conn.execute(
+                "SELECT * FROM units WHERE status = 'pending' "
+                "OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY id LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE units SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated = ? WHERE id = ?",
+                [(owner, now + self.lease_seconds, now, row['id']) for row in rows]
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return rows
+
+    def complete(self, unit_id, owner, events):
+        """Store the parsed events for a unit; ignored if the lease was lost"""
+        cursor = self.conn.execute(
+            "UPDATE units SET status = 'done', events = ?, lease_owner = NULL, "
+            "lease_expires = NULL, last_error = NULL, updated = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (json.dumps(events, ensure_ascii=False), time.time(), unit_id, owner)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, unit_id, owner, error):
+        """Release a unit for retry, or mark it failed once attempts run out"""
+        cursor = self.conn.execute(
+            "UPDATE units SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "lease_owner = NULL, lease_expires = NULL, last_error = ?, updated = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (self.max_attempts, str(error), time.time(), unit_id, owner)
+        )
+        return cursor.rowcount == 1
+
+    def retry_failed(self):
+        """Put failed units back in the queue with a fresh attempt budget"""
+        return self.conn.execute(
+            "UPDATE units SET status = 'pending', attempts = 0 WHERE status = 'failed'"
+        ).rowcount
+
+    def release_leases(self):
+        """Return every leased unit to the queue, e.g. after all workers of a run crashed"""
+        return self.conn.execute(
+            "UPDATE units SET status = 'pending', lease_owner = NULL, lease_expires = NULL "
+            "WHERE status = 'leased'"
+        ).rowcount
+
+    def outstanding_leases(self):
+        return self.conn.execute("SELECT COUNT(*) FROM units WHERE status = 'leased'").fetchone()[0]
+
+    def status_counts(self):
+        rows = self.conn.execute(
+            "SELECT source, status, COUNT(*) AS n FROM units GROUP BY source, status ORDER BY source"
+        ).fetchall()
+        return [(row['source'], row['status'], row['n']) for row in rows]
+
+    def completed(self, source):
+        """Yield (year, month, location, events) for finished units of a source"""
+        rows = self.conn.execute(
+            "SELECT year, month, location, events FROM units "
+            "WHERE source = ? AND status = 'done' ORDER BY year, id",
+            (source,)
+        )
+        for row in rows:
+            yield row['year'], row['month'], row['location'], json.loads(row['events'])
+
+
+def run_worker(path, owner=None, delay=2.0, lease_seconds=300, shared=False):
+    """Lease and process units until the frontier is empty"""
+    owner = owner or f"{socket.gethostname()}-{os.getpid()}"
+    frontier = CrawlFrontier(path, lease_seconds=lease_seconds, shared=shared)
+    processed = 0
+    try:
+        while True:
+            units = frontier.lease(owner)
+            if not units:
+                # Units leased by other workers may still come back on failure or expiry
+                if not frontier.outstanding_leases():
+                    break
+                time.sleep(max(delay, 1.0))
+                continue
+            unit = units[0]
+            label = ' '.join(str(part) for part in (unit['source'], unit['year'], unit['month'], unit['location']) if part)
+            print(f"[{owner}] Fetching {label} (attempt {unit['attempts'] + 1})")
+            try:
+                events = HANDLERS[unit['source']](unit['year'], unit['month'], unit['location'])
+            except Exception as e:
+                print(f"[{owner}] Error for {label}: {e}")
+                frontier.fail(unit['id'], owner, e)
+            else:
+                if not frontier.complete(unit['id'], owner, events):
+                    print(f"[{owner}] Lease on {label} expired before completion, result dropped")
+                processed += 1
+
+            # Be respectful to the server
+            time.sleep(delay)
+    finally:
+        frontier.close()
+    print(f"[{owner}] Finished after {processed} units")
+    return processed
+
+
+def export_indian_national_days(frontier, year, filename='indian_national_days.json'):
+    """Rebuild indian_national_days.json from completed careerpower units"""
+    scraper = IndianNationalDaysScraper()
+    for unit_year, month, location, events in frontier.completed('careerpower'):
+        if unit_year == year:
+            scraper.all_events[month] = events
+    scraper.all_events = {month: scraper.all_events[month]
+                          for month in scraper.months if month in scraper.all_events}
+    scraper.clean_and_deduplicate()
+    scraper.print_summary()
+    scraper.save_to_json(filename)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resumable crawl frontier for calendar scrapes')
+    parser.add_argument('--db', default='crawl_frontier.db', help='SQLite frontier file')
+    parser.add_argument('--shared', action='store_true',
+                        help='Use the rollback journal so machines sharing the file over a network '
+                             'filesystem can lease safely (WAL only works on one host)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    seed = commands.add_parser('seed', help='Add units to the frontier')
+    seed.add_argument('source', choices=SOURCES)
+    seed.add_argument('--years', help='Year or range, e.g. 2020-2025 (default: 2025, or the current '
+                                      'year for sources without per-year pages)')
+    seed.add_argument('--locations', default='', help='Comma separated Drik Panchang geoname ids')
+
+    work = commands.add_parser('work', help='Process units until none are left')
+    work.add_argument('--processes', type=int, default=1)
+    work.add_argument('--delay', type=float, default=2.0, help='Seconds to wait between fetches')
+    work.add_argument('--lease', type=int, default=300, help='Lease length in seconds')
+
+    commands.add_parser('status', help='Show unit counts per source and state')
+    commands.add_parser('retry', help='Requeue failed units')
+    commands.add_parser('release', help='Requeue units leased by workers that are no longer running')
+
+    export = commands.add_parser('export', help='Write indian_national_days.json from finished units')
+    export.add_argument('--year', type=int, default=datetime.now().year)
+
+    args = parser.parse_args()
+
+    if args.command == 'work':
+        # Make sure the schema exists before the workers race to create it
+        CrawlFrontier(args.db, shared=args.shared).close()
+        workers = [Process(target=run_worker, args=(args.db, None, args.delay, args.lease, args.shared))
+                   for _ in range(args.processes)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return
+
+    frontier = CrawlFrontier(args.db, shared=args.shared)
+    try:
+        if args.command == 'seed':
+            default_year = datetime.now().year if args.source in YEARLESS_SOURCES else 2025
+            first, _, last = (args.years or str(default_year)).partition('-')
+            years = range(int(first), int(last or first) + 1)
+            months = IndianNationalDaysScraper().months if args.source == 'careerpower' else ['']
+            locations = [loc.strip() for loc in args.locations.split(',') if loc.strip()] or ['']
+            try:
+                added = frontier.seed(args.source, years, months, locations)
+            except ValueError as e:
+                parser.error(str(e))
+            print(f"Added {added} new units")
+        elif args.command == 'retry':
+            print(f"Requeued {frontier.retry_failed()} failed units")
+        elif args.command == 'release':
+            print(f"Released {frontier.release_leases()} leased units")
+        elif args.command == 'export':
+            export_indian_national_days(frontier, args.year)
+
+        for source, status, count in frontier.status_counts():
+            print(f"{source:14}{status:10}{count:5}")
+    finally:
+        frontier.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Hedged Fetcher
+Fetches a page through several routes (direct and CORS proxies): starts the
+fastest known route, launches the next one if no valid answer has arrived within
+that route's usual latency, keeps the first valid response and cancels the rest
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from urllib.parse import quote
+
+import requests
+
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+
+class Cancelled(Exception):
+    pass
+
+
+class Route:
+    def __init__(self, name, template='{url}', unwrap=None):
+        """``template`` receives the quoted target as {quoted} or the raw one as {url}"""
+        self.name = name
+        self.template = template
+        self.unwrap = unwrap
+
+    def url_for(self, target):
+        return self.template.format(url=target, quoted=quote(target, safe=''))
+
+
+def _allorigins_contents(body):
+    return json.loads(body)['contents'].encode('utf-8')
+
+
+# Same routes index.html tries one after another
+CORS_ROUTES = [
+    Route('direct'),
+    Route('codetabs', 'https://api.codetabs.com/v1/proxy?quest={quoted}'),
+    Route('htmldriven', 'https://cors-proxy.htmldriven.com/?url={quoted}'),
+    Route('allorigins', 'https://api.allorigins.win/get?url={quoted}', _allorigins_contents),
+]
+
+
+def is_drik_panchang_page(body):
+    return b'dpEventInfo' in body
+
+
+def is_indian_calendar_page(body):
+    """Same check as scrapeIndianEvents in index.html"""
+    return b'dpEventInfo' in body or b'dpCalendarDate' in body
+
+
+def add_hedged_arguments(parser):
+    parser.add_argument('--hedged', action='store_true',
+                        help='Race the direct URL and the CORS proxies, keeping the first valid page')
+    parser.add_argument('--route-stats', default='route_stats.json', metavar='FILE',
+                        help='Per-route latency history used to order routes (default: route_stats.json)')
+
+
+class RouteStats:
+    def __init__(self, window=50):
+        self.latencies = deque(maxlen=window)
+        self.attempts = 0
+        self.failures = 0
+        self.wins = 0
+
+    def percentile(self, pct):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    def score(self, default):
+        """Expected seconds to a valid answer: median latency inflated by the failure rate"""
+        median = self.percentile(50)
+        if median is None:
+            return default
+        success_rate = 1 - self.failures / self.attempts if self.attempts else 1.0
+        return median / max(success_rate, 0.1)
+
+
+class HedgedFetcher:
+    def __init__(self, routes=None, validate=None, hedge_percentile=90, default_delay=1.0,
+                 min_delay=0.05, max_delay=5.0, timeout=15, connect_timeout=5, stats_file=None):
+        """``timeout`` is the longest gap between bytes; losers still waiting for headers exit on it"""
+        self.routes = routes or CORS_ROUTES
+        self.validate = validate or (lambda body: bool(body))
+        self.hedge_percentile = hedge_percentile
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.stats_file = stats_file
+        self.stats = {route.name: RouteStats() for route in self.routes}
+        self.lock = threading.Lock()
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        self._load_stats()
+
+    def ordered_routes(self):
+        with self.lock:
+            return sorted(self.routes, key=lambda route: self.stats[route.name].score(self.default_delay))
+
+    def hedge_delay(self, route):
+        with self.lock:
+            latency = self.stats[route.name].percentile(self.hedge_percentile)
+        return min(max(latency if latency is not None else self.default_delay, self.min_delay), self.max_delay)
+
+    def _download(self, route, target, cancel, responses):
+        response = self.session.get(route.url_for(target), timeout=(self.connect_timeout, self.timeout),
+                                    stream=True)
+        with response:
+            # Registered so the winner can close this socket instead of waiting for the next chunk
+            responses.append(response)
+            if cancel.is_set():
+                raise Cancelled()
+            response.raise_for_status()
+            chunks = []
+            for chunk in response.iter_content(65536):
+                if cancel.is_set():
+                    raise Cancelled()
+                chunks.append(chunk)
+        body = b''.join(chunks)
+        return route.unwrap(body) if route.unwrap else body
+
+    def _attempt(self, route, target, cancel, responses, results):
+        start = time.perf_counter()
+        try:
+            body = self._download(route, target, cancel, responses)
+            outcome = 'ok' if self.validate(body) else 'invalid'
+        except Exception as e:
+            # Reads on a response closed by the winner fail with whatever urllib3 raises
+            body, outcome = None, 'cancelled' if cancel.is_set() else f'error: {e}'
+        results.put((route, body, outcome, time.perf_counter() - start))
+
+    def _record(self, route, outcome, elapsed):
+        with self.lock:
+            stats = self.stats[route.name]
+            stats.attempts += 1
+            if outcome == 'ok':
+                stats.wins += 1
+                stats.latencies.append(elapsed)
+            elif outcome == 'cancelled':
+                # The route was at least this slow; keep that as a latency sample
+                stats.latencies.append(elapsed)
+                stats.attempts -= 1
+            else:
+                stats.failures += 1
+
+    def fetch(self, target):
+        """Body of the first valid response for ``target`` across all routes"""
+        routes = self.ordered_routes()
+        cancel = threading.Event()
+        responses = []
+        results = queue.Queue()
+        launched = []
+
+        def launch():
+            route = routes[len(launched)]
+            launched.append(route)
+            # A fresh daemon thread per attempt: a stuck loser never delays a hedge or interpreter exit
+            threading.Thread(target=self._attempt, args=(route, target, cancel, responses, results),
+                             daemon=True).start()
+
+        launch()
+        pending = 1
+        errors = []
+        while True:
+            delay = self.hedge_delay(launched[-1]) if len(launched) < len(routes) else None
+            try:
+                route, body, outcome, elapsed = results.get(timeout=delay)
+            except queue.Empty:
+                launch()
+                pending += 1
+                continue
+
+            pending -= 1
+            self._record(route, outcome, elapsed)
+            if outcome == 'ok':
+                cancel.set()
+                for response in list(responses):
+                    response.close()
+                # Losers report in the background; their elapsed time still informs ordering
+                threading.Thread(target=self._drain, args=(results, pending), daemon=True).start()
+                self._save_stats()
+                return body
+
+            errors.append(f'{route.name}: {outcome}')
+            if len(launched) < len(routes):
+                launch()
+                pending += 1
+            elif pending == 0:
+                self._save_stats()
+                raise RuntimeError(f"All routes failed for {target} ({'; '.join(errors)})")
+
+    def _drain(self, results, pending):
+        for _ in range(pending):
+            route, _, outcome, elapsed = results.get()
+            self._record(route, outcome, elapsed)
+
+    def _load_stats(self):
+        if not self.stats_file:
+            return
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        for name, values in saved.items():
+            if name in self.stats:
+                stats = self.stats[name]
+                stats.latencies.extend(values.get('latencies', []))
+                stats.attempts = values.get('attempts', 0)
+                stats.failures = values.get('failures', 0)
+                stats.wins = values.get('wins', 0)
+
+    def _save_stats(self):
+        if not self.stats_file:
+            return
+        with self.lock:
+            data = {name: {'latencies': list(stats.latencies), 'attempts': stats.attempts,
+                           'failures': stats.failures, 'wins': stats.wins}
+                    for name, stats in self.stats.items()}
+        with open(self.stats_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+    def print_stats(self):
+        print(f"{'Route':14}{'wins':>6}{'fails':>7}{'p50 ms':>9}{'p90 ms':>9}")
+        for route in self.ordered_routes():
+            stats = self.stats[route.name]
+            p50, p90 = stats.percentile(50), stats.percentile(90)
+            print(f"{route.name:14}{stats.wins:6}{stats.failures:7}"
+                  f"{p50 * 1000 if p50 is not None else 0:9.0f}{p90 * 1000 if p90 is not None else 0:9.0f}")
+
+
+def sequential_fetch(routes, target, validate, timeout=30):
+    """What index.html does: try each route in turn until one returns a valid page"""
+    for route in routes:
+        try:
+            response = requests.get(route.url_for(target), headers=HEADERS, timeout=timeout)
+            body = route.unwrap(response.content) if route.unwrap else response.content
+            if validate(body):
+                return body
+        except Exception:
+            continue
+    raise RuntimeError(f"All routes failed for {target}")
+
+
+def demo(requests_total=200, seed=1):
+    """Race local stand-in routes: a primary with a slow tail, a steady backup and a broken one"""
+    from load_test import FakeUpstream, PANCHANG_PATH, load_pages, percentile
+
+    pages = load_pages()
+    upstreams = {
+        'primary': FakeUpstream(pages, latency=0.05, jitter=0.01, slow_rate=0.05, slow_latency=1.5, seed=seed),
+        'backup': FakeUpstream(pages, latency=0.15, jitter=0.02, seed=seed + 1),
+        'broken': FakeUpstream(pages, latency=0.02, jitter=0.0, error_rate=1.0, seed=seed + 2),
+    }
+    for upstream in upstreams.values():
+        upstream.start()
+    routes = [Route(name, upstream.base_url + '{url}') for name, upstream in upstreams.items()]
+    target = PANCHANG_PATH + '?year=2025'
+
+    try:
+        print("\n" + "="*60)
+        print(f"HEDGED vs SEQUENTIAL FETCH ({requests_total} fetches, local routes)")
+        print("="*60)
+
+        for label in ('sequential', 'hedged'):
+            fetcher = HedgedFetcher(routes, is_drik_panchang_page, default_delay=0.3, timeout=5)
+            latencies = []
+            for _ in range(requests_total):
+                start = time.perf_counter()
+                if label == 'hedged':
+                    fetcher.fetch(target)
+                else:
+                    sequential_fetch(routes, target, is_drik_panchang_page, timeout=5)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            print(f"\n{label}: p50 {percentile(latencies, 50) * 1000:.0f} ms, "
+                  f"p95 {percentile(latencies, 95) * 1000:.0f} ms, "
+                  f"p99 {percentile(latencies, 99) * 1000:.0f} ms")
+            if label == 'hedged':
+                fetcher.print_stats()
+
+        print("\nUpstream requests: " + ', '.join(
+            f"{name} {sum(upstream.counts.values())}" for name, upstream in upstreams.items()))
+        print("="*60)
+    finally:
+        for upstream in upstreams.values():
+            upstream.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hedged fetching across direct and proxy routes')
+    parser.add_argument('url', nargs='?', help='Page to fetch')
+    parser.add_argument('--demo', action='store_true', help='Race local stand-in routes and compare')
+    parser.add_argument('--route-stats', default='route_stats.json', metavar='FILE')
+    args = parser.parse_args()
+
+    if args.demo or not args.url:
+        demo()
+        return
+
+    fetcher = HedgedFetcher(validate=is_drik_panchang_page, stats_file=args.route_stats)
+    body = fetcher.fetch(args.url)
+    print(f"Fetched {len(body)} bytes")
+    fetcher.print_stats()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Load Test Harness
+Starts a local stand-in for Drik Panchang, the UN observances list and Career Power,
+then drives the scrape paths against it at a chosen concurrency and reports
+throughput, latency percentiles and how many requests reached the upstream
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import scrape_panchang
+import scrape_un_days
+from scrape_indian_national_days import IndianNationalDaysScraper
+from parallel_parse import make_synthetic_page
+
+PANCHANG_PATH = '/iskcon/iskcon-event-calendar.html'
+UN_PATH = '/en/observances/list-days-weeks'
+CAREERPOWER_PREFIX = '/blog/important-days-in-'
+
+TARGETS = ('panchang', 'un', 'careerpower', 'netlify')
+
+
+def synthetic_un_page(events=200):
+    months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+    rows = ''.join(
+        '<div class="views-row">'
+        f'<span class="views-field-title"><a href="#">International Day {i}</a></span>'
+        '<div class="views-field-field-event-date-1">'
+        f'<span class="date-display-single">{i % 28 + 1:02d} {months[i % 12]}</span></div>'
+        '</div>'
+        for i in range(events)
+    )
+    return f'<html><body>{rows}</body></html>'.encode('utf-8')
+
+
+def synthetic_careerpower_page(month, events=30):
+    rows = ''.join(
+        f'<tr><td>{i + 1} {month.capitalize()}</td><td>National Day {i}</td></tr>'
+        for i in range(events)
+    )
+    return (f'<html><body><table><tr><td>Dates</td><td>Days</td></tr>{rows}</table>'
+            '</body></html>').encode('utf-8')
+
+
+def load_pages(pages_dir=None):
+    """Recorded pages from ``pages_dir`` (drikpanchang.html, un.html, careerpower-<month>.html)
+    with synthetic markup for anything missing"""
+    pages = {
+        'drikpanchang': make_synthetic_page(2025),
+        'un': synthetic_un_page(),
+    }
+    for month in IndianNationalDaysScraper().months:
+        pages[f'careerpower-{month}'] = synthetic_careerpower_page(month)
+
+    if pages_dir:
+        for name in os.listdir(pages_dir):
+            key, ext = os.path.splitext(name)
+            if ext == '.html':
+                with open(os.path.join(pages_dir, name), 'rb') as f:
+                    pages[key] = f.read()
+    return pages
+
+
+class FakeUpstream:
+    """Threaded HTTP server that answers like the upstream calendar sites"""
+
+    def __init__(self, pages, latency=0.05, jitter=0.02, error_rate=0.0, rate_limit_rate=0.0, seed=None,
+                 slow_rate=0.0, slow_latency=2.0):
+        self.pages = pages
+        self.latency = latency
+        self.jitter = jitter
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.random = random.Random(seed)
+        self.counts = Counter()
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _page_for(self, path):
+        if path == PANCHANG_PATH:
+            return 'drikpanchang', self.pages.get('drikpanchang')
+        if path == UN_PATH:
+            return 'un', self.pages.get('un')
+        if path.startswith(CAREERPOWER_PREFIX):
+            key = 'careerpower-' + path[len(CAREERPOWER_PREFIX):]
+            return 'careerpower', self.pages.get(key)
+        return 'unknown', None
+
+    def _decide(self, path):
+        with self.lock:
+            roll = self.random.random()
+            delay = max(0.0, self.random.gauss(self.latency, self.jitter))
+            if self.random.random() < self.slow_rate:
+                delay += self.slow_latency
+        route, body = self._page_for(path)
+        if body is None:
+            status = 404
+        elif roll < self.rate_limit_rate:
+            status = 429
+        elif roll < self.rate_limit_rate + self.error_rate:
+            status = 503
+        else:
+            status = 200
+        with self.lock:
+            self.counts[(route, status)] += 1
+        return delay, status, body
+
+    def _handler_class(self):
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                delay, status, body = upstream._decide(urlparse(self.path).path)
+                time.sleep(delay)
+                self.send_response(status)
+                if status == 429:
+                    self.send_header('Retry-After', '1')
+                if status != 200:
+                    body = f'<html><body>{status}</body></html>'.encode('utf-8')
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def _point_scrapers_at(base_url):
+    """Redirect the Python scrapers to the fake upstream"""
+    scrape_panchang.URL = base_url + PANCHANG_PATH + '?year={}'
+    scrape_un_days.UN_URL = base_url + UN_PATH
+
+
+def _python_call(target, i, year, base_url):
+    if target == 'panchang':
+        return len(scrape_panchang.extract_events(scrape_panchang.fetch_page(year), verbose=False))
+    if target == 'un':
+        return sum(len(events) for events in scrape_un_days.scrape_un_days().values())
+    scraper = IndianNationalDaysScraper()
+    scraper.base_url = base_url + CAREERPOWER_PREFIX + '{}'
+    month = scraper.months[i % 12]
+    return len(scraper.parse_month(scraper.fetch_month(month), month))
+
+
+def drive_python(target, base_url, requests_total, concurrency, year=2025):
+    """Run a Python scrape path ``requests_total`` times; returns [(seconds, ok)]"""
+    _point_scrapers_at(base_url)
+
+    def one(i):
+        start = time.perf_counter()
+        try:
+            ok = _python_call(target, i, year, base_url) > 0
+        except Exception:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    # The scrapers print per-event progress; keep it out of the report
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(one, range(requests_total)))
+
+
+NODE_DRIVER = r"""
+const { handler } = require(process.env.HANDLER_PATH);
+const total = parseInt(process.env.REQUESTS, 10);
+const concurrency = parseInt(process.env.CONCURRENCY, 10);
+const year = process.env.YEAR;
+const results = [];
+let next = 0;
+async function worker() {
+  while (next < total) {
+    next++;
+    const start = process.hrtime.bigint();
+    let ok = false;
+    try {
+      const res = await handler({ httpMethod: 'GET', queryStringParameters: { year } }, {});
+      ok = res.statusCode === 200 && JSON.parse(res.body).events.length > 0;
+    } catch (e) {}
+    results.push([Number(process.hrtime.bigint() - start) / 1e9, ok]);
+  }
+}
+Promise.all(Array.from({ length: concurrency }, worker)).then(() => {
+  process.stdout.write(JSON.stringify(results));
+});
+"""
+
+
+def drive_netlify(base_url, requests_total, concurrency, year=2025):
+    """Run the Netlify function handler under node against the fake upstream"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ,
+               DRIK_PANCHANG_BASE_URL=base_url,
+               HANDLER_PATH=os.path.join(here, 'netlify', 'functions', 'scrape.js'),
+               REQUESTS=str(requests_total),
+               CONCURRENCY=str(concurrency),
+               YEAR=str(year))
+    completed = subprocess.run(['node', '-e', NODE_DRIVER], env=env, cwd=here,
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"node driver failed (run 'npm install' first?): {completed.stderr.strip()}")
+    return [tuple(item) for item in json.loads(completed.stdout)]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def print_report(target, results, elapsed, upstream_counts, concurrency):
+    latencies = sorted(seconds for seconds, ok in results)
+    ok_count = sum(1 for seconds, ok in results if ok)
+    upstream_total = sum(upstream_counts.values())
+
+    print("\n" + "="*60)
+    print(f"LOAD TEST: {target} (concurrency {concurrency})")
+    print("="*60)
+    print(f"{'Requests':18}: {len(results)} ({ok_count} ok, {len(results) - ok_count} failed)")
+    print(f"{'Elapsed':18}: {elapsed:.2f}s")
+    print(f"{'Throughput':18}: {len(results) / elapsed:.1f} req/s")
+    for pct in (50, 95, 99):
+        print(f"{f'p{pct} latency':18}: {percentile(latencies, pct) * 1000:.1f} ms")
+    print("-"*60)
+    print(f"{'Upstream requests':18}: {upstream_total} "
+          f"({upstream_total / max(len(results), 1):.2f} per scrape)")
+    for (route, status), count in sorted(upstream_counts.items()):
+        print(f"  {route:14} {status}: {count}")
+    print("="*60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the scrape paths against a fake upstream')
+    parser.add_argument('target', choices=TARGETS)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.05, help='Mean upstream latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.02, help='Latency standard deviation')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of 503 responses')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of 429 responses')
+    parser.add_argument('--slow-rate', type=float, default=0.0, help='Fraction of responses with extra latency')
+    parser.add_argument('--slow-latency', type=float, default=2.0, help='Extra latency of slow responses')
+    parser.add_argument('--pages', help='Directory of recorded pages')
+    parser.add_argument('--year', type=int, default=2025)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    upstream = FakeUpstream(load_pages(args.pages), args.latency, args.jitter,
+                            args.error_rate, args.rate_limit_rate, args.seed,
+                            args.slow_rate, args.slow_latency).start()
+    print(f"Fake upstream listening on {upstream.base_url}")
+    try:
+        start = time.perf_counter()
+        if args.target == 'netlify':
+            results = drive_netlify(upstream.base_url, args.requests, args.concurrency, args.year)
+        else:
+            results = drive_python(args.target, upstream.base_url, args.requests,
+                                   args.concurrency, args.year)
+        elapsed = time.perf_counter() - start
+    finally:
+        upstream.stop()
+
+    print_report(args.target, results, elapsed, upstream.counts, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
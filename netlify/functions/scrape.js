@@ -1,6 +1,8 @@
 const fetch = require('node-fetch');
 const { JSDOM } = require('jsdom');
 
+const DRIK_PANCHANG_BASE_URL = process.env.DRIK_PANCHANG_BASE_URL || 'https://www.drikpanchang.com';
+
 exports.handler = async (event, context) => {
   const headers = {
     'Access-Control-Allow-Origin': '*',
@@ -14,7 +16,7 @@ exports.handler = async (event, context) => {
 
   try {
     const year = event.queryStringParameters?.year || '2025';
-    const url = `https://www.drikpanchang.com/iskcon/iskcon-event-calendar.html?year=${year}`;
+    const url = `${DRIK_PANCHANG_BASE_URL}/iskcon/iskcon-event-calendar.html?year=${year}`;
     
     const response = await fetch(url, {
       headers: {
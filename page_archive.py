@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+"""
+Raw Page Archive
+Append-only store of every fetched calendar page, keyed by (source, year, month,
+location, fetch time), compressed with a dictionary trained on the archive itself
+and indexed in SQLite so any page can be read back or replayed through the parsers
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import tempfile
+import time
+import zlib
+from collections import Counter
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dictionaries (
+    id INTEGER PRIMARY KEY,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL,
+    samples INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    id INTEGER PRIMARY KEY,
+    digest BLOB NOT NULL UNIQUE,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    dictionary_id INTEGER REFERENCES dictionaries (id),
+    file TEXT NOT NULL DEFAULT 'pages.bin'
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    month TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    fetched_at REAL NOT NULL,
+    blob_id INTEGER NOT NULL REFERENCES blobs (id)
+);
+CREATE INDEX IF NOT EXISTS pages_key ON pages (source, year, month, location, fetched_at);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', '1');
+"""
+
+BLOB_COLUMNS = 'b.id AS blob_id, b.file, b.offset, b.length, b.raw_size, b.codec, b.dictionary_id'
+
+CODEC = 'zstd' if zstandard else 'zlib'
+LEVELS = {'zstd': 9, 'zlib': 9}
+# zlib can only look back 32 KiB, so a larger preset dictionary is wasted
+DICT_SIZES = {'zstd': 112 * 1024, 'zlib': 32 * 1024}
+# Train the first dictionary once this many distinct pages are stored
+TRAIN_AFTER = 64
+
+
+def _data_file(generation):
+    """Data file of a repack generation; generation 1 is the original pages.bin"""
+    return 'pages.bin' if generation == 1 else f'pages-{generation}.bin'
+
+
+def _file_generation(name):
+    match = re.fullmatch(r'pages(?:-(\d+))?\.bin', name)
+    return (int(match.group(1)) if match.group(1) else 1) if match else None
+
+
+def add_archive_argument(parser):
+    parser.add_argument('--archive', nargs='?', const='page_archive', metavar='DIR',
+                        help='Keep every fetched page in the raw page archive under DIR (default: page_archive/)')
+
+
+def _train_zlib_dictionary(samples, size):
+    """Preset dictionary for zlib: the markup fragments shared by the most pages.
+
+    zlib has no trainer, so fragments (split after each '>') are ranked by how
+    many samples contain them times their length. The most valuable fragments go
+    last, where back-references from the start of a page are cheapest.
+    """
+    document_frequency = Counter()
+    for sample in samples:
+        document_frequency.update(set(fragment + b'>' for fragment in sample.split(b'>') if fragment))
+    threshold = max(2, len(samples) // 4)
+    ranked = sorted((count * len(fragment), fragment)
+                    for fragment, count in document_frequency.items() if count >= threshold)
+    chosen = []
+    budget = size
+    for _, fragment in reversed(ranked):
+        if len(fragment) <= budget:
+            chosen.append(fragment)
+            budget -= len(fragment)
+    return b''.join(reversed(chosen))
+
+
+def train_dictionary(samples, codec=CODEC, size=None):
+    size = size or DICT_SIZES[codec]
+    if codec == 'zlib':
+        return _train_zlib_dictionary(samples, size)
+    try:
+        return zstandard.train_dictionary(size, samples).as_bytes()
+    except zstandard.ZstdError:
+        # Too few or too similar samples for the trainer: use recent raw content instead
+        return b''.join(samples)[-size:]
+
+
+class _Codec:
+    def __init__(self, codec, dictionary=None, level=None):
+        if codec == 'zstd' and not zstandard:
+            raise RuntimeError("This archive uses zstd; install the zstandard package to read it")
+        self.codec = codec
+        self.dictionary = dictionary
+        self.level = level or LEVELS[codec]
+        if codec == 'zstd':
+            dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            self._compressor = zstandard.ZstdCompressor(level=self.level, dict_data=dict_data)
+            self._decompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+
+    def compress(self, raw):
+        if self.codec == 'zstd':
+            return self._compressor.compress(raw)
+        if self.dictionary:
+            compressor = zlib.compressobj(self.level, zdict=self.dictionary)
+        else:
+            compressor = zlib.compressobj(self.level)
+        return compressor.compress(raw) + compressor.flush()
+
+    def decompress(self, data):
+        if self.codec == 'zstd':
+            return self._decompressor.decompress(data)
+        if self.dictionary:
+            decompressor = zlib.decompressobj(zdict=self.dictionary)
+        else:
+            decompressor = zlib.decompressobj()
+        return decompressor.decompress(data) + decompressor.flush()
+
+
+class PageArchive:
+    def __init__(self, path='page_archive', level=None, train_after=TRAIN_AFTER):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.level = level
+        self.train_after = train_after
+        self.conn = sqlite3.connect(os.path.join(path, 'index.db'), timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        if 'file' not in {row['name'] for row in self.conn.execute('PRAGMA table_info(blobs)')}:
+            # Archives from before repack generations kept everything in pages.bin
+            self.conn.execute("ALTER TABLE blobs ADD COLUMN file TEXT NOT NULL DEFAULT 'pages.bin'")
+        if not zstandard and self.conn.execute("SELECT 1 FROM blobs WHERE codec = 'zstd' LIMIT 1").fetchone():
+            self.conn.close()
+            raise RuntimeError(f"{path} holds zstd pages; install the zstandard package to open it")
+        self._readers = {}
+        self._codecs = {}
+
+    def close(self):
+        for fd in self._readers.values():
+            os.close(fd)
+        self._readers.clear()
+        self.conn.close()
+
+    def _generation(self):
+        return int(self.conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0])
+
+    def _reader(self, name):
+        if name not in self._readers:
+            self._readers[name] = os.open(os.path.join(self.path, name), os.O_RDONLY)
+        return self._readers[name]
+
+    def _codec(self, codec, dictionary_id):
+        key = (codec, dictionary_id)
+        if key not in self._codecs:
+            dictionary = None
+            if dictionary_id is not None:
+                dictionary = self.conn.execute('SELECT data FROM dictionaries WHERE id = ?',
+                                               (dictionary_id,)).fetchone()['data']
+            self._codecs[key] = _Codec(codec, dictionary, self.level)
+        return self._codecs[key]
+
+    def _current_dictionary_id(self):
+        row = self.conn.execute('SELECT MAX(id) AS id FROM dictionaries WHERE codec = ?', (CODEC,)).fetchone()
+        return row['id']
+
+    def add(self, source, raw, year=None, month='', location='', fetched_at=None):
+        """Archive one fetched page; identical bytes are stored once. Returns the page id"""
+        fetched_at = fetched_at or time.time()
+        year = year or datetime.fromtimestamp(fetched_at).year
+        digest = hashlib.blake2b(raw, digest_size=20).digest()
+
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            blob = self.conn.execute('SELECT id FROM blobs WHERE digest = ?', (digest,)).fetchone()
+            if blob:
+                blob_id = blob['id']
+            else:
+                dictionary_id = self._current_dictionary_id()
+                frame = self._codec(CODEC, dictionary_id).compress(raw)
+                # Read under the write lock, so a repack can never happen between this and the append
+                data_file = _data_file(self._generation())
+                with open(os.path.join(self.path, data_file), 'ab') as f:
+                    offset = f.seek(0, os.SEEK_END)
+                    f.write(frame)
+                blob_id = self.conn.execute(
+                    'INSERT INTO blobs (digest, offset, length, raw_size, codec, dictionary_id, file) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (digest, offset, len(frame), len(raw), CODEC, dictionary_id, data_file)).lastrowid
+            page_id = self.conn.execute(
+                'INSERT INTO pages (source, year, month, location, fetched_at, blob_id) VALUES (?, ?, ?, ?, ?, ?)',
+                (source, year, month or '', location or '', fetched_at, blob_id)).lastrowid
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+
+        if self.train_after and not blob and self._current_dictionary_id() is None:
+            if self.conn.execute('SELECT COUNT(*) FROM blobs').fetchone()[0] >= self.train_after:
+                self.train()
+        return page_id
+
+    def _read_blob(self, blob):
+        try:
+            fd = self._reader(blob['file'])
+        except FileNotFoundError:
+            # Another process repacked since ``blob`` was looked up; files already open stay readable
+            blob = self.conn.execute(f'SELECT {BLOB_COLUMNS} FROM blobs b WHERE b.id = ?',
+                                     (blob['blob_id'],)).fetchone()
+            fd = self._reader(blob['file'])
+        frame = os.pread(fd, blob['length'], blob['offset'])
+        return self._codec(blob['codec'], blob['dictionary_id']).decompress(frame)
+
+    def get(self, page_id):
+        blob = self.conn.execute(
+            f'SELECT {BLOB_COLUMNS} FROM pages p JOIN blobs b ON b.id = p.blob_id WHERE p.id = ?',
+            (page_id,)).fetchone()
+        if blob is None:
+            raise KeyError(page_id)
+        return self._read_blob(blob)
+
+    def find(self, source=None, year=None, month=None, location=None, since=None, until=None, latest=False):
+        """Matching pages in fetch order; ``latest`` keeps only the newest fetch of each key"""
+        clauses, params = [], []
+        for column, value in (('source', source), ('year', year), ('month', month), ('location', location)):
+            if value is not None:
+                clauses.append(f'p.{column} = ?')
+                params.append(value)
+        if since is not None:
+            clauses.append('p.fetched_at >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('p.fetched_at < ?')
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        columns = f'p.id, p.source, p.year, p.month, p.location, p.fetched_at, {BLOB_COLUMNS}'
+        if latest:
+            # SQLite returns the other columns from the row holding MAX()
+            query = (f'SELECT {columns}, MAX(p.fetched_at) FROM pages p JOIN blobs b ON b.id = p.blob_id '
+                     f'{where} GROUP BY p.source, p.year, p.month, p.location ORDER BY p.fetched_at')
+        else:
+            query = f'SELECT {columns} FROM pages p JOIN blobs b ON b.id = p.blob_id {where} ORDER BY p.fetched_at, p.id'
+        return self.conn.execute(query, params).fetchall()
+
+    def replay(self, rows):
+        """Yield (row, raw bytes) for each row of ``find``, reading the data files in offset order"""
+        for row in sorted(rows, key=lambda row: (row['file'], row['offset'])):
+            yield row, self._read_blob(row)
+
+    def train(self, samples=500, seed=0):
+        """Train a new dictionary from a sample of stored pages; later pages are compressed with it"""
+        ids = [row['id'] for row in self.conn.execute('SELECT id FROM pages')]
+        chosen = random.Random(seed).sample(ids, min(samples, len(ids)))
+        raws = list({raw for raw in (self.get(page_id) for page_id in chosen)})
+        if not raws:
+            raise RuntimeError("Nothing archived yet to train on")
+        dictionary = train_dictionary(raws)
+        dictionary_id = self.conn.execute(
+            'INSERT INTO dictionaries (codec, data, samples, created) VALUES (?, ?, ?, ?)',
+            (CODEC, dictionary, len(raws), time.time())).lastrowid
+        print(f"Trained {CODEC} dictionary {dictionary_id} ({len(dictionary) / 1024:.1f} KiB) "
+              f"on {len(raws)} pages")
+        return dictionary_id
+
+    def repack(self):
+        """Rewrite every stored page with the newest dictionary into the next generation's data file.
+
+        The index switches to the new file in the same commit that records the
+        new offsets; older files are only removed after that commit, so a crash
+        at any point leaves the index pointing at complete data.
+        """
+        dictionary_id = self._current_dictionary_id()
+        codec = self._codec(CODEC, dictionary_id)
+        self.conn.execute('BEGIN IMMEDIATE')
+        new_path = None
+        try:
+            generation = self._generation() + 1
+            new_file = _data_file(generation)
+            new_path = os.path.join(self.path, new_file)
+            blobs = self.conn.execute(f'SELECT {BLOB_COLUMNS} FROM blobs b ORDER BY b.file, b.offset').fetchall()
+            with open(new_path, 'wb') as f:
+                for blob in blobs:
+                    frame = codec.compress(self._read_blob(blob))
+                    self.conn.execute(
+                        'UPDATE blobs SET file = ?, offset = ?, length = ?, codec = ?, dictionary_id = ? '
+                        'WHERE id = ?',
+                        (new_file, f.tell(), len(frame), CODEC, dictionary_id, blob['blob_id']))
+                    f.write(frame)
+                f.flush()
+                os.fsync(f.fileno())
+            self.conn.execute("UPDATE meta SET value = ? WHERE key = 'generation'", (str(generation),))
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            if new_path and os.path.exists(new_path):
+                os.remove(new_path)
+            raise
+
+        # Only older generations: a later repack may already be writing a newer one
+        for name in os.listdir(self.path):
+            old_generation = _file_generation(name)
+            if old_generation is not None and old_generation < generation:
+                fd = self._readers.pop(name, None)
+                if fd is not None:
+                    os.close(fd)
+                os.remove(os.path.join(self.path, name))
+
+    def stats(self):
+        """Page counts and raw vs stored bytes, overall and per source"""
+        sources = {}
+        for row in self.conn.execute(
+                'SELECT p.source, COUNT(*) AS pages, COUNT(DISTINCT p.blob_id) AS blobs, '
+                'SUM(b.raw_size) AS raw_bytes FROM pages p JOIN blobs b ON b.id = p.blob_id GROUP BY p.source'):
+            sources[row['source']] = dict(row)
+        totals = self.conn.execute(
+            'SELECT COUNT(*) AS blobs, COALESCE(SUM(raw_size), 0) AS unique_bytes, '
+            'COALESCE(SUM(length), 0) AS stored_bytes FROM blobs').fetchone()
+        dictionary_bytes = self.conn.execute(
+            'SELECT COALESCE(SUM(LENGTH(data)), 0) FROM dictionaries').fetchone()[0]
+        raw_bytes = sum(source['raw_bytes'] for source in sources.values())
+        stored_bytes = totals['stored_bytes'] + dictionary_bytes
+        return {
+            'codec': CODEC,
+            'pages': sum(source['pages'] for source in sources.values()),
+            'blobs': totals['blobs'],
+            'raw_bytes': raw_bytes,
+            'unique_bytes': totals['unique_bytes'],
+            'stored_bytes': stored_bytes,
+            'dictionary_bytes': dictionary_bytes,
+            'ratio': raw_bytes / stored_bytes if stored_bytes else 0.0,
+            'sources': sources
+        }
+
+
+def parse_archived_page(key, raw):
+    """Worker: run the parser matching an archived page's source; ``key`` is (page_id, source, month)"""
+    # Imported here because the scrapers import this module for --archive
+    from parallel_parse import parse_indian_month_page, parse_panchang_page
+    from scrape_un_days import parse_un_page
+    import scrape_indian_calendar
+
+    page_id, source, month = key
+    if source == 'drikpanchang':
+        return parse_panchang_page(key, raw)
+    if source == 'careerpower':
+        return parse_indian_month_page(month, raw)
+    if source == 'un':
+        return tuple((month_num, e['date'], e['name'])
+                     for month_num, events in sorted(parse_un_page(raw, verbose=False).items()) for e in events)
+    if source == 'indiancalendar':
+        return tuple((e['date'], e['name']) for e in scrape_indian_calendar.extract_events(raw, verbose=False))
+    raise ValueError(f"No parser for source {source!r}")
+
+
+def replay_parse(archive, rows, workers=1):
+    """Parse archived pages; returns ((page_id, source, month), events) pairs and the elapsed time"""
+    start = time.perf_counter()
+    if workers > 1:
+        from parallel_parse import run_pipeline
+        by_id = {row['id']: row for row in rows}
+        # Load every codec up front; the SQLite connection stays on this thread
+        for row in rows:
+            archive._codec(row['codec'], row['dictionary_id'])
+        jobs = [(row['id'], row['source'], row['month']) for row in sorted(rows, key=lambda row: (row['file'], row['offset']))]
+        # One reader thread: decompression is far faster than parsing
+        results = run_pipeline(jobs, lambda key: archive._read_blob(by_id[key[0]]),
+                               parse_archived_page, workers, fetch_workers=1)
+    else:
+        results = [((row['id'], row['source'], row['month']),
+                    parse_archived_page((row['id'], row['source'], row['month']), raw))
+                   for row, raw in archive.replay(rows)]
+    return results, time.perf_counter() - start
+
+
+def print_stats(stats):
+    print("\n" + "="*60)
+    print(f"PAGE ARCHIVE ({stats['codec']})")
+    print("="*60)
+    for source, values in sorted(stats['sources'].items()):
+        print(f"{source:16}{values['pages']:8} pages {values['blobs']:8} distinct "
+              f"{values['raw_bytes'] / 1e6:10.1f} MB raw")
+    print("-"*60)
+    print(f"{stats['pages']} pages, {stats['blobs']} distinct, {stats['raw_bytes'] / 1e6:.1f} MB raw, "
+          f"{stats['stored_bytes'] / 1e6:.2f} MB stored "
+          f"(dictionaries {stats['dictionary_bytes'] / 1024:.0f} KiB)")
+    print(f"Compression ratio: {stats['ratio']:.1f}x overall, "
+          f"{stats['unique_bytes'] / stats['stored_bytes'] if stats['stored_bytes'] else 0:.1f}x on distinct pages")
+    print("="*60)
+
+
+def _synthetic_corpus(pages, seed=0):
+    """Near-identical re-fetches across sources, the way repeated scrapes look"""
+    from load_test import synthetic_careerpower_page, synthetic_un_page
+    from parallel_parse import make_synthetic_page
+    from scrape_indian_national_days import IndianNationalDaysScraper
+
+    rng = random.Random(seed)
+    months = IndianNationalDaysScraper().months
+    corpus = []
+    for i in range(pages):
+        kind = rng.random()
+        stamp = f'<!-- served {1700000000 + i * 3600} -->'.encode('utf-8')
+        if kind < 0.7:
+            year = rng.choice(range(2020, 2031))
+            location = rng.choice(['', '1277333', '5128581', '2643743'])
+            raw = make_synthetic_page(year, rng.randint(180, 220)) + stamp
+            corpus.append(('drikpanchang', raw, year, '', location))
+        elif kind < 0.9:
+            month = rng.choice(months)
+            corpus.append(('careerpower', synthetic_careerpower_page(month, rng.randint(25, 35)) + stamp,
+                           2026, month, ''))
+        else:
+            corpus.append(('un', synthetic_un_page(rng.randint(190, 210)) + stamp, 2026, '', ''))
+    return corpus
+
+
+def benchmark(pages=400, workers=None):
+    """Compression ratio with and without a trained dictionary, then replay throughput"""
+    workers = workers or os.cpu_count() or 1
+    corpus = _synthetic_corpus(pages)
+    raw_total = sum(len(raw) for _, raw, *_ in corpus)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(os.path.join(tmp, 'archive'), train_after=0)
+        start = time.perf_counter()
+        for i, (source, raw, year, month, location) in enumerate(corpus):
+            archive.add(source, raw, year, month, location, fetched_at=1700000000 + i)
+        ingest = time.perf_counter() - start
+        plain = archive.stats()
+
+        archive.train()
+        start = time.perf_counter()
+        archive.repack()
+        repack = time.perf_counter() - start
+        trained = archive.stats()
+
+        print("\n" + "="*60)
+        print(f"PAGE ARCHIVE BENCHMARK ({pages} pages, {raw_total / 1e6:.1f} MB raw, {CODEC})")
+        print("="*60)
+        print(f"Ingest: {pages / ingest:.0f} pages/s")
+        print(f"Without dictionary: {plain['stored_bytes'] / 1e6:.2f} MB stored, {plain['ratio']:.1f}x")
+        print(f"With dictionary:    {trained['stored_bytes'] / 1e6:.2f} MB stored, {trained['ratio']:.1f}x "
+              f"(repack {repack:.2f}s)")
+
+        rows = archive.find()
+        start = time.perf_counter()
+        replayed = sum(len(raw) for _, raw in archive.replay(rows))
+        elapsed = time.perf_counter() - start
+        print(f"Replay, read only:  {len(rows) / elapsed:8.0f} pages/s  {replayed / 1e6 / elapsed:8.1f} MB/s")
+
+        for worker_count in sorted({1, workers}):
+            results, elapsed = replay_parse(archive, rows, worker_count)
+            events = sum(len(events) for _, events in results)
+            print(f"Replay + parse, {worker_count:2} worker{'s' if worker_count > 1 else ' '}: "
+                  f"{len(rows) / elapsed:6.0f} pages/s  {replayed / 1e6 / elapsed:8.1f} MB/s  ({events} events)")
+        print("="*60)
+        archive.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect, train and replay the raw page archive')
+    parser.add_argument('--path', default='page_archive')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('stats', help='Compression ratio per source')
+    subparsers.add_parser('train', help='Train a new dictionary from the archived pages')
+    subparsers.add_parser('repack', help='Recompress everything with the newest dictionary')
+
+    replay = subparsers.add_parser('replay', help='Run the parsers over archived pages')
+    replay.add_argument('--source')
+    replay.add_argument('--year', type=int)
+    replay.add_argument('--month')
+    replay.add_argument('--location')
+    replay.add_argument('--latest', action='store_true', help='Only the newest fetch of each page')
+    replay.add_argument('--workers', type=int, default=1)
+
+    bench = subparsers.add_parser('benchmark', help='Synthetic ingest, compression and replay run')
+    bench.add_argument('--pages', type=int, default=400)
+    bench.add_argument('--workers', type=int)
+
+    args = parser.parse_args()
+
+    if args.command == 'benchmark':
+        benchmark(args.pages, args.workers)
+        return
+
+    archive = PageArchive(args.path)
+    try:
+        if args.command == 'stats':
+            print_stats(archive.stats())
+        elif args.command == 'train':
+            archive.train()
+            print("Run 'repack' to recompress pages stored before this dictionary")
+        elif args.command == 'repack':
+            archive.repack()
+            print_stats(archive.stats())
+        elif args.command == 'replay':
+            rows = archive.find(args.source, args.year, args.month, args.location, latest=args.latest)
+            results, elapsed = replay_parse(archive, rows, args.workers)
+            raw_bytes = sum(row['raw_size'] for row in rows)
+            events = sum(len(events) for _, events in results)
+            print(f"Replayed {len(rows)} pages ({raw_bytes / 1e6:.1f} MB) into {events} events "
+                  f"in {elapsed:.2f}s: {len(rows) / elapsed if elapsed else 0:.0f} pages/s, "
+                  f"{raw_bytes / 1e6 / elapsed if elapsed else 0:.1f} MB/s")
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
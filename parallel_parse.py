@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Parallel Parse Stage
+Fans raw calendar pages out to a process pool so HTML parsing uses every core
+while the network fetches keep running in a thread pool
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from scrape_panchang import fetch_page, extract_events, group_by_month, print_planner
+from scrape_indian_national_days import IndianNationalDaysScraper
+
+
+def parse_panchang_page(key, raw):
+    """Worker: compact (date, name) tuples for one Drik Panchang page"""
+    return tuple((e['date'], e['name']) for e in extract_events(raw, verbose=False))
+
+
+def parse_indian_month_page(month, raw):
+    """Worker: compact (date, event) tuples for one Career Power month page"""
+    return tuple((e['date'], e['event']) for e in IndianNationalDaysScraper.parse_month(raw, month))
+
+
+def run_pipeline(jobs, fetch, parse, workers=None, fetch_workers=4):
+    """Fetch every job in threads and parse each page in a process pool as soon as it lands.
+
+    Only raw bytes go to the workers and only tuples come back, so nothing
+    heavier than the page itself crosses the process boundary. Results are
+    returned as (key, events) pairs in the same order as ``jobs``.
+    """
+    workers = workers or os.cpu_count() or 1
+    parse_futures = [None] * len(jobs)
+
+    with ThreadPoolExecutor(max_workers=fetch_workers) as fetch_pool, \
+            ProcessPoolExecutor(max_workers=workers) as parse_pool:
+        fetch_futures = {fetch_pool.submit(fetch, key): i for i, key in enumerate(jobs)}
+
+        for future in as_completed(fetch_futures):
+            i = fetch_futures[future]
+            try:
+                raw = future.result()
+            except Exception as e:
+                print(f"Error fetching {jobs[i]}: {e}")
+                continue
+            parse_futures[i] = parse_pool.submit(parse, jobs[i], raw)
+
+        results = []
+        for key, future in zip(jobs, parse_futures):
+            if future is None:
+                results.append((key, ()))
+                continue
+            try:
+                results.append((key, future.result()))
+            except Exception as e:
+                print(f"Error parsing {key}: {e}")
+                results.append((key, ()))
+
+    return results
+
+
+def _fetch_panchang(key):
+    year, location = key
+    return fetch_page(year, location)
+
+
+def scrape_panchang_pages(years, locations=(None,), workers=None, fetch_workers=4):
+    """Scrape Drik Panchang pages for every (year, location) pair"""
+    jobs = [(year, location) for year in years for location in locations]
+    results = run_pipeline(jobs, _fetch_panchang, parse_panchang_page, workers, fetch_workers)
+    return {key: [{'date': date, 'name': name} for date, name in events] for key, events in results}
+
+
+def scrape_indian_months(scraper, workers=None, fetch_workers=2):
+    """Fill ``scraper.all_events`` using the parallel pipeline instead of scrape_all_months"""
+    results = run_pipeline(scraper.months, scraper.fetch_month, parse_indian_month_page,
+                           workers, fetch_workers)
+    for month, events in results:
+        scraper.all_events[month] = [
+            {'date': date, 'event': event, 'month': month.capitalize()}
+            for date, event in events
+        ]
+        print(f"Found {len(events)} events for {month.capitalize()}")
+
+
+def make_synthetic_page(year, events_per_page=400):
+    """Build a page with the same dpEventInfo markup as the Drik Panchang calendar"""
+    month_names = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+                   'August', 'September', 'October', 'November', 'December']
+    blocks = []
+    for i in range(events_per_page):
+        month = month_names[i % 12]
+        day = i % 28 + 1
+        blocks.append(
+            '<div class="dpEventCard"><div class="dpEventInfo">'
+            f'<div class="dpEventGregDate">{month} {day}, {year}, Monday</div>'
+            f'<div class="dpEventName dpHinduEventColor">Festival {i}</div>'
+            '<div class="dpEventDesc"><p>Observed by devotees worldwide.</p></div>'
+            '</div></div>'
+        )
+    return f"<html><body><div class='dpContent'>{''.join(blocks)}</div></body></html>".encode('utf-8')
+
+
+def benchmark(pages=48, events_per_page=400, max_workers=None):
+    """Time the parse stage alone over synthetic pages with 1..N worker processes"""
+    max_workers = max_workers or os.cpu_count() or 1
+    corpus = {i: make_synthetic_page(2000 + i, events_per_page) for i in range(pages)}
+    jobs = list(corpus)
+
+    print("\n" + "="*60)
+    print(f"PARSE SCALING BENCHMARK ({pages} pages x {events_per_page} events)")
+    print("="*60)
+
+    baseline = None
+    expected = None
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        results = run_pipeline(jobs, corpus.__getitem__, parse_panchang_page, workers)
+        elapsed = time.perf_counter() - start
+
+        if expected is None:
+            expected = results
+        elif results != expected:
+            print(f"Warning: results with {workers} workers differ from the single worker run")
+
+        baseline = baseline or elapsed
+        print(f"{workers:3} workers: {elapsed:7.2f}s  {pages / elapsed:7.1f} pages/s  "
+              f"speedup {baseline / elapsed:4.2f}x")
+
+    print("="*60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parse calendar pages in a process pool')
+    parser.add_argument('--years', default='2025', help='Year or range, e.g. 2020-2025')
+    parser.add_argument('--locations', default='', help='Comma separated Drik Panchang geoname ids')
+    parser.add_argument('--indian', action='store_true', help='Scrape Indian national days instead')
+    parser.add_argument('--workers', type=int, default=None, help='Parse processes (default: all cores)')
+    parser.add_argument('--benchmark', action='store_true', help='Run the parse scaling benchmark')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(max_workers=args.workers)
+        return
+
+    if args.indian:
+        scraper = IndianNationalDaysScraper()
+        scrape_indian_months(scraper, args.workers)
+        scraper.clean_and_deduplicate()
+        scraper.print_summary()
+        scraper.save_to_json()
+        return
+
+    first, _, last = args.years.partition('-')
+    years = range(int(first), int(last or first) + 1)
+    locations = [loc.strip() for loc in args.locations.split(',') if loc.strip()] or [None]
+
+    for (year, location), events in scrape_panchang_pages(years, locations, args.workers).items():
+        print(f"\n{year}{f' ({location})' if location else ''}: {len(events)} events\n")
+        print_planner(group_by_month(events))
+
+
+if __name__ == "__main__":
+    main()
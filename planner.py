@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Planner Engine
+Builds the monthly planner text from any mix of calendar sources by k-way merging
+their day-sorted event streams, with rendered months memoized per source set
+"""
+
+import argparse
+import calendar
+import heapq
+import json
+import os
+import re
+from datetime import datetime
+from itertools import combinations
+
+from scrape_panchang import MONTHS
+
+SOURCES = ('iskcon', 'indian', 'maharaj', 'un')
+SOURCE_FILES = {
+    'iskcon': 'iskcon_events_{year}.json',
+    'indian': 'indian_national_days.json',
+    'maharaj': 'iskcon_maharaj_days.json',
+    'un': 'un_days.json',
+}
+MONTH_NAMES = [name.lower() for name in calendar.month_name]
+
+
+def _day_of(date_text):
+    match = re.match(r'\s*(\d{1,2})', date_text)
+    return int(match.group(1)) if match else None
+
+
+def _load_json(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _iskcon_records(data):
+    """Drik Panchang snapshot: a list of {'date': 'December 17, 2025, Wednesday', 'name': ...}.
+
+    Yields (month, day, year, name, event) for every event whose date parses.
+    """
+    for event in data:
+        try:
+            parts = event['date'].split(',')
+            date_obj = datetime.strptime(parts[0] + ', ' + parts[1].strip(), '%B %d, %Y')
+        except (ValueError, IndexError):
+            print(f"Date parsing error for '{event['date']}'")
+            continue
+        yield date_obj.month, date_obj.day, date_obj.year, event['name'], event
+
+
+def _month_keyed_records(data):
+    """indian_national_days.json, iskcon_maharaj_days.json and un_days.json layouts.
+
+    Yields (month, day, None, name, event) for every event with a day; these files carry no year.
+    """
+    for key, events in data.items():
+        month = int(key) if key.isdigit() else MONTH_NAMES.index(key.lower())
+        for event in events:
+            day = _day_of(event['date'])
+            if day is not None:
+                yield month, day, None, event.get('event') or event.get('name'), event
+
+
+def source_records(source, data):
+    """(month, day, year or None, name, event) for a loaded source file"""
+    return _iskcon_records(data) if source == 'iskcon' else _month_keyed_records(data)
+
+
+def _source_stream(source, data):
+    """{month_number: [(day, name), ...]} for a loaded source file"""
+    by_month = {}
+    for month, day, _, name, _ in source_records(source, data):
+        by_month.setdefault(month, []).append((day, name))
+    return by_month
+
+
+class PlannerEngine:
+    def __init__(self, data_dir='.'):
+        self.data_dir = data_dir
+        self._streams = {}
+        self._rendered = {}
+
+    def register(self, source, year, events_by_month):
+        """Add or replace a source stream: {month_number: [(day, name), ...]}"""
+        self._streams[(source, year)] = {
+            month: sorted(events, key=lambda event: event[0])
+            for month, events in events_by_month.items()
+        }
+        self._rendered = {key: text for key, text in self._rendered.items()
+                          if key[0] != year or source not in key[2]}
+
+    def _stream(self, source, year):
+        key = (source, year)
+        if key not in self._streams:
+            path = os.path.join(self.data_dir, SOURCE_FILES[source].format(year=year))
+            data = _load_json(path)
+            events_by_month = _source_stream(source, data) if data is not None else {}
+            self.register(source, year, events_by_month)
+        return self._streams[key]
+
+    def merged(self, year, month, sources):
+        """Yield (day, name) across ``sources`` in day order, ties kept in source order"""
+        streams = [self._stream(source, year).get(month, []) for source in sources]
+        return heapq.merge(*streams, key=lambda event: event[0])
+
+    def render_month(self, year, month, sources=SOURCES):
+        """Planner text for one month, or '' when no source has events that month"""
+        sources = tuple(sources)
+        key = (year, month, sources)
+        if key in self._rendered:
+            return self._rendered[key]
+
+        by_day = {}
+        for day, name in self.merged(year, month, sources):
+            by_day.setdefault(day, []).append(name)
+
+        lines = []
+        if by_day:
+            lines.append(f"{MONTHS[month - 1]} Planner\n")
+            for day in range(1, calendar.monthrange(year, month)[1] + 1):
+                event_names = by_day.get(day)
+                if event_names:
+                    lines.append(f"{day}. {event_names[0]}")
+                    lines.extend(f"   {name}" for name in event_names[1:])
+                else:
+                    lines.append(f"{day}.")
+            lines.append('\n')
+
+        text = '\n'.join(lines)
+        self._rendered[key] = text
+        return text
+
+    def render_year(self, year, sources=SOURCES):
+        return ''.join(self.render_month(year, month, sources) for month in range(1, 13))
+
+    def prerender(self, years, output_dir, sources=SOURCES):
+        """Write every year x month x source-set planner under output_dir/<year>/<sources>/"""
+        written = 0
+        for year in years:
+            for size in range(1, len(sources) + 1):
+                for combo in combinations(sources, size):
+                    combo_dir = os.path.join(output_dir, str(year), '+'.join(combo))
+                    os.makedirs(combo_dir, exist_ok=True)
+                    for month in range(1, 13):
+                        with open(os.path.join(combo_dir, f'{month:02d}.txt'), 'w', encoding='utf-8') as f:
+                            f.write(self.render_month(year, month, combo))
+                    with open(os.path.join(combo_dir, 'year.txt'), 'w', encoding='utf-8') as f:
+                        f.write(self.render_year(year, combo))
+                    written += 13
+        print(f"Wrote {written} planner files to {output_dir}")
+        return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render planner text from merged calendar sources')
+    parser.add_argument('--year', default='2025', help='Year, or a range like 2024-2026 with --prerender')
+    parser.add_argument('--month', type=int, help='Only render this month (1-12)')
+    parser.add_argument('--sources', default=','.join(SOURCES), help='Comma separated: ' + ', '.join(SOURCES))
+    parser.add_argument('--data-dir', default='.')
+    parser.add_argument('--prerender', metavar='DIR', help='Write every year x month x source combination to DIR')
+    args = parser.parse_args()
+
+    sources = tuple(source.strip() for source in args.sources.split(',') if source.strip())
+    unknown = set(sources) - set(SOURCES)
+    if unknown:
+        parser.error(f"unknown sources: {', '.join(sorted(unknown))}")
+
+    engine = PlannerEngine(args.data_dir)
+    first, _, last = args.year.partition('-')
+    years = range(int(first), int(last or first) + 1)
+
+    if args.prerender:
+        engine.prerender(years, args.prerender, sources)
+    elif args.month:
+        print(engine.render_month(years[0], args.month, sources))
+    else:
+        print(engine.render_year(years[0], sources))
+
+
+if __name__ == "__main__":
+    main()
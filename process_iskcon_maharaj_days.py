@@ -4,11 +4,19 @@ ISKCON Maharaj Days Processor
 Converts swamisiskcon.csv to JSON format similar to indian_national_days.json
 """
 
+import argparse
 import csv
-import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
 from datetime import datetime
 import re
 
+from change_feed import save_snapshot
+from profiling import StageProfiler, add_profile_argument
+
 def parse_date(date_str):
     """Parse various date formats and return month and formatted date"""
     if not date_str or date_str.strip() == '-':
@@ -52,72 +60,102 @@ def parse_date(date_str):
     print(f"Could not parse date: {date_str}")
     return None, None
 
-def process_maharaj_data():
-    """Process the CSV file and create JSON structure"""
-    maharaj_days = {
-        'january': [],
-        'february': [],
-        'march': [],
-        'april': [],
-        'may': [],
-        'june': [],
-        'july': [],
-        'august': [],
-        'september': [],
-        'october': [],
-        'november': [],
-        'december': []
-    }
+MONTH_KEYS = ['january', 'february', 'march', 'april', 'may', 'june',
+              'july', 'august', 'september', 'october', 'november', 'december']
+
+EVENT_TYPES = (('appearance', 'Appearance Day'), ('disappearance', 'Disappearance Day'))
+
+# Read the CSV through a 1 MiB buffer; rows are consumed as they are decoded
+CHUNK_BYTES = 1 << 20
+
+def parse_event_slot(date_str, parsed_dates):
+    """(month_index, day) for a CSV date cell, () when it is empty or unparseable.
+
+    ``parsed_dates`` caches results across rows, since the same date strings repeat.
+    """
+    slot = parsed_dates.get(date_str)
+    if slot is None:
+        slot = ()
+        if date_str and date_str != '-':
+            month, formatted_date = parse_date(date_str)
+            if month:
+                slot = (MONTH_KEYS.index(month), int(formatted_date.split()[0]))
+        parsed_dates[date_str] = slot
+    return slot
+
+def stream_maharaj_csv(filename='swamisiskcon.csv'):
+    """Bucket every appearance/disappearance into its (month, day) slot in one pass.
+
+    Returns ``(slots, counts)`` where ``slots[month][day]`` holds ``(name, type)``
+    pairs in CSV order and ``counts[type][month]`` is kept up to date as rows
+    are read, so neither a sort nor a second scan is needed afterwards.
+    """
+    slots = [[[] for _ in range(32)] for _ in range(12)]
+    counts = {event_type: [0] * 12 for event_type, _ in EVENT_TYPES}
+    parsed_dates = {}
     
-    with open('swamisiskcon.csv', 'r', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
+    with open(filename, 'r', encoding='utf-8', newline='', buffering=CHUNK_BYTES) as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+        try:
+            columns = [header.index('Maharaj'), header.index('App'), header.index('Disapp')]
+        except ValueError:
+            print(f"{filename} is missing a Maharaj, App or Disapp column")
+            return slots, counts
+        width = max(columns) + 1
+        name_col, date_cols = columns[0], columns[1:]
         
         for row in reader:
-            maharaj_name = row.get('Maharaj', '').strip()
-            appearance_date = row.get('App', '').strip()
-            disappearance_date = row.get('Disapp', '').strip()
-            
+            if len(row) < width:
+                continue
+            maharaj_name = row[name_col].strip()
             if not maharaj_name:
                 continue
             
-            # Process appearance date
-            if appearance_date and appearance_date != '-':
-                month, formatted_date = parse_date(appearance_date)
-                if month and formatted_date:
-                    event = {
-                        "date": formatted_date,
-                        "event": f"{maharaj_name} - Appearance Day",
-                        "month": month.capitalize(),
-                        "type": "appearance"
-                    }
-                    maharaj_days[month].append(event)
-            
-            # Process disappearance date
-            if disappearance_date and disappearance_date != '-':
-                month, formatted_date = parse_date(disappearance_date)
-                if month and formatted_date:
-                    event = {
-                        "date": formatted_date,
-                        "event": f"{maharaj_name} - Disappearance Day",
-                        "month": month.capitalize(),
-                        "type": "disappearance"
-                    }
-                    maharaj_days[month].append(event)
+            for date_col, (event_type, _) in zip(date_cols, EVENT_TYPES):
+                slot = parse_event_slot(row[date_col].strip(), parsed_dates)
+                if slot:
+                    month_index, day = slot
+                    slots[month_index][day].append((maharaj_name, event_type))
+                    counts[event_type][month_index] += 1
     
-    # Sort events by date within each month
-    for month in maharaj_days:
-        maharaj_days[month].sort(key=lambda x: int(x['date'].split()[0]))
-    
-    return maharaj_days
+    return slots, counts
+
+def month_events(month_index, day_slots):
+    """Expand one month's day buckets into its list of event dicts"""
+    labels = dict(EVENT_TYPES)
+    month_name = MONTH_KEYS[month_index].capitalize()
+    events = []
+    for day, bucket in enumerate(day_slots):
+        if not bucket:
+            continue
+        formatted_date = f"{day:02d} {month_name}"
+        for maharaj_name, event_type in bucket:
+            events.append({
+                "date": formatted_date,
+                "event": f"{maharaj_name} - {labels[event_type]}",
+                "month": month_name,
+                "type": event_type
+            })
+    return events
+
+def buckets_to_months(slots):
+    """Expand (month, day) buckets into the month-keyed JSON structure"""
+    return {month: month_events(month_index, slots[month_index])
+            for month_index, month in enumerate(MONTH_KEYS)}
+
+def process_maharaj_data(filename='swamisiskcon.csv'):
+    """Process the CSV file and create JSON structure"""
+    slots, _ = stream_maharaj_csv(filename)
+    return buckets_to_months(slots)
 
 def save_to_json(data, filename='iskcon_maharaj_days.json'):
     """Save data to JSON file"""
-    with open(filename, 'w', encoding='utf-8') as jsonfile:
-        json.dump(data, jsonfile, indent=2, ensure_ascii=False)
+    save_snapshot(filename, data)
     print(f"Data saved to {filename}")
 
-def generate_summary(data):
-    """Generate a summary of the data"""
+def generate_summary(data, counts=None):
+    """Generate a summary of the data, using running counts from stream_maharaj_csv when given"""
     print("\n" + "="*60)
     print("ISKCON MAHARAJ DAYS SUMMARY")
     print("="*60)
@@ -127,8 +165,13 @@ def generate_summary(data):
     disappearance_count = 0
     
     for month, events in data.items():
-        month_appearances = len([e for e in events if e['type'] == 'appearance'])
-        month_disappearances = len([e for e in events if e['type'] == 'disappearance'])
+        if counts:
+            month_index = MONTH_KEYS.index(month)
+            month_appearances = counts['appearance'][month_index]
+            month_disappearances = counts['disappearance'][month_index]
+        else:
+            month_appearances = len([e for e in events if e['type'] == 'appearance'])
+            month_disappearances = len([e for e in events if e['type'] == 'disappearance'])
         total_month = len(events)
         
         if total_month > 0:
@@ -142,9 +185,7 @@ def generate_summary(data):
     print(f"{'Total':12}: {total_events:2} events ({appearance_count} appearances, {disappearance_count} disappearances)")
     print("="*60)
 
-def generate_html_report(data, filename='iskcon_maharaj_days.html'):
-    """Generate an HTML report"""
-    html_content = """
+HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -268,26 +309,16 @@ def generate_html_report(data, filename='iskcon_maharaj_days.html'):
 </body>
 </html>
     """
+
+def render_month_section(month, events):
+    """HTML block for one month; returns (html, appearances, disappearances)"""
+    if not events:
+        return "", 0, 0
     
-    month_sections = ""
-    total_events = 0
-    total_appearances = 0
-    total_disappearances = 0
-    
-    month_order = ['january', 'february', 'march', 'april', 'may', 'june',
-                   'july', 'august', 'september', 'october', 'november', 'december']
+    appearances = len([e for e in events if e['type'] == 'appearance'])
+    disappearances = len(events) - appearances
     
-    for month in month_order:
-        events = data.get(month, [])
-        if events:
-            appearances = len([e for e in events if e['type'] == 'appearance'])
-            disappearances = len([e for e in events if e['type'] == 'disappearance'])
-            
-            total_events += len(events)
-            total_appearances += appearances
-            total_disappearances += disappearances
-            
-            month_sections += f"""
+    parts = [f"""
             <div class="month-section">
                 <div class="month-header">{month.capitalize()} ({len(events)} events - {appearances} app, {disappearances} dis)</div>
                 <table class="events-table">
@@ -299,56 +330,145 @@ def generate_html_report(data, filename='iskcon_maharaj_days.html'):
                         </tr>
                     </thead>
                     <tbody>
-            """
-            
-            for event in events:
-                event_type = event['type']
-                row_class = 'appearance' if event_type == 'appearance' else 'disappearance'
-                type_display = '🎂 Appearance' if event_type == 'appearance' else '🙏 Disappearance'
-                
-                month_sections += f"""
+            """]
+    
+    for event in events:
+        event_type = event['type']
+        row_class = 'appearance' if event_type == 'appearance' else 'disappearance'
+        type_display = '🎂 Appearance' if event_type == 'appearance' else '🙏 Disappearance'
+        
+        parts.append(f"""
                     <tr class="{row_class}">
                         <td class="date-cell">{event['date']}</td>
                         <td class="event-cell">{event['event']}</td>
                         <td>{type_display}</td>
                     </tr>
-                """
-            
-            month_sections += """
+                """)
+    
+    parts.append("""
                     </tbody>
                 </table>
             </div>
-            """
+            """)
+    return "".join(parts), appearances, disappearances
+
+def write_html_report(sections, filename='iskcon_maharaj_days.html'):
+    """Assemble rendered month sections (month -> render_month_section result) into the report"""
+    total_events = total_appearances = total_disappearances = 0
+    for month in MONTH_KEYS:
+        _, appearances, disappearances = sections.get(month, ("", 0, 0))
+        total_appearances += appearances
+        total_disappearances += disappearances
+    total_events = total_appearances + total_disappearances
     
-    final_html = html_content.format(
-        total_events=total_events,
-        appearances=total_appearances,
-        disappearances=total_disappearances,
-        generation_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        month_sections=month_sections
-    )
+    # The template's CSS is full of braces, so fill the placeholders by name
+    final_html = HTML_TEMPLATE
+    for placeholder, value in (
+        ('{total_events}', total_events),
+        ('{appearances}', total_appearances),
+        ('{disappearances}', total_disappearances),
+        ('{generation_date}', datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        ('{month_sections}', "".join(sections.get(month, ("",))[0] for month in MONTH_KEYS)),
+    ):
+        final_html = final_html.replace(placeholder, str(value), 1)
     
     with open(filename, 'w', encoding='utf-8') as htmlfile:
         htmlfile.write(final_html)
     
     print(f"HTML report saved to {filename}")
 
+def generate_html_report(data, filename='iskcon_maharaj_days.html'):
+    """Generate an HTML report"""
+    sections = {month: render_month_section(month, data.get(month, [])) for month in MONTH_KEYS}
+    write_html_report(sections, filename)
+
+def write_synthetic_csv(filename, rows):
+    """Write a swamisiskcon.csv-shaped file with ``rows`` made-up entries"""
+    rng = random.Random(rows)
+    month_names = [month.capitalize() for month in MONTH_KEYS]
+    
+    def random_date():
+        day, month, year = rng.randint(1, 28), rng.randint(1, 12), rng.randint(1900, 2020)
+        style = rng.random()
+        if style < 0.6:
+            return f"{day} {month_names[month - 1]} {year}"
+        if style < 0.8:
+            return f"{day}/{month}/{year}"
+        return f"{day} {month_names[month - 1][:3]} {year}"
+    
+    with open(filename, 'w', encoding='utf-8', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['Maharaj', 'App', 'Disapp'])
+        for i in range(rows):
+            disappearance = random_date() if rng.random() < 0.3 else '-'
+            writer.writerow([f"HH Synthetic Swami {i} Maharaj", random_date(), disappearance])
+
+def benchmark(rows=1_000_000):
+    """Time the streaming processor on a synthetic CSV and report its peak traced memory"""
+    fd, filename = tempfile.mkstemp(suffix='.csv')
+    os.close(fd)
+    try:
+        write_synthetic_csv(filename, rows)
+        size_mb = os.path.getsize(filename) / 1e6
+        
+        start = time.perf_counter()
+        slots, counts = stream_maharaj_csv(filename)
+        elapsed = time.perf_counter() - start
+        events = sum(sum(month_counts) for month_counts in counts.values())
+        del slots
+        
+        tracemalloc.start()
+        slots, counts = stream_maharaj_csv(filename)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del slots
+    finally:
+        os.remove(filename)
+    
+    print("\n" + "="*60)
+    print(f"STREAMING BENCHMARK ({rows:,} rows, {size_mb:.1f} MB CSV)")
+    print("="*60)
+    print(f"{'Events':18}: {events:,}")
+    print(f"{'Elapsed':18}: {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)")
+    print(f"{'Peak memory':18}: {peak / 1e6:.1f} MB ({peak / max(events, 1):.0f} bytes per event)")
+    print("="*60)
+
 def main():
+    parser = argparse.ArgumentParser(description='Convert swamisiskcon.csv to iskcon_maharaj_days.json')
+    parser.add_argument('--input', default='swamisiskcon.csv')
+    parser.add_argument('--benchmark', type=int, metavar='ROWS',
+                        help='Benchmark the streaming processor on a synthetic CSV instead')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    profiler = StageProfiler('process_iskcon_maharaj_days', args.profile, mode=args.profile_mode)
+    
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return
+    
     print("🕉️ ISKCON Maharaj Days Processor")
     print("=" * 50)
-    print("Processing swamisiskcon.csv...")
+    print(f"Processing {args.input}...")
     
     # Process the data
-    maharaj_data = process_maharaj_data()
+    with profiler.stage('parse'):
+        slots, counts = stream_maharaj_csv(args.input)
+    with profiler.stage('clean'):
+        maharaj_data = buckets_to_months(slots)
     
     # Generate summary
-    generate_summary(maharaj_data)
+    with profiler.stage('report'):
+        generate_summary(maharaj_data, counts)
     
     # Save to JSON
-    save_to_json(maharaj_data)
+    with profiler.stage('save'):
+        save_to_json(maharaj_data)
     
     # Generate HTML report
-    generate_html_report(maharaj_data)
+    with profiler.stage('report'):
+        generate_html_report(maharaj_data)
+    
+    profiler.finish()
     
     print("\n✅ Processing completed successfully!")
     print("\nGenerated files:")
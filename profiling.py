@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Stage Profiler
+Shared --profile mode for the scrapers: a cProfile or a tracemalloc diff per
+pipeline stage (fetch, parse, clean, save, report), written to a run directory
+as .pstats and collapsed stacks for flamegraph tools, or as top-N allocation reports
+"""
+
+import argparse
+import cProfile
+import os
+import pstats
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+STAGES = ('fetch', 'parse', 'clean', 'save', 'report')
+PROFILE_MODES = ('cpu', 'allocations')
+
+
+def add_profile_argument(parser):
+    parser.add_argument('--profile', nargs='?', const='profiles', metavar='DIR',
+                        help='Profile each stage and write reports under DIR (default: profiles/)')
+    parser.add_argument('--profile-mode', choices=PROFILE_MODES, default='cpu',
+                        help='Record CPU time or allocations; they are never traced together '
+                             'because tracemalloc would inflate the CPU profile')
+
+
+class StageProfiler:
+    def __init__(self, name, output_dir=None, top=25, mode='cpu'):
+        """Profiling is off unless ``output_dir`` is given, so callers can always wrap stages"""
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}")
+        self.name = name
+        self.enabled = bool(output_dir)
+        self.top = top
+        self.mode = mode
+        self.run_dir = None
+        self._profiles = {}
+        self._allocations = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+        if self.enabled:
+            stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+            suffix = '-allocations' if mode == 'allocations' else ''
+            self.run_dir = os.path.join(output_dir, f'{name}-{stamp}{suffix}')
+            os.makedirs(self.run_dir, exist_ok=True)
+
+    @contextmanager
+    def stage(self, stage_name):
+        """Profile the block; re-entering the same stage accumulates into one report"""
+        if not self.enabled:
+            yield
+            return
+
+        if self.mode == 'cpu':
+            profile = self._profiles.setdefault(stage_name, cProfile.Profile())
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+            return
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        try:
+            yield
+        finally:
+            after = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            allocations = self._allocations[stage_name]
+            for diff in after.compare_to(before, 'lineno'):
+                frame = diff.traceback[0]
+                if frame.filename == tracemalloc.__file__:
+                    continue
+                totals = allocations[(frame.filename, frame.lineno)]
+                totals[0] += diff.size_diff
+                totals[1] += diff.count_diff
+
+    def finish(self):
+        """Write every stage report; returns the run directory"""
+        if not self.enabled:
+            return None
+
+        for stage_name, profile in self._profiles.items():
+            base = os.path.join(self.run_dir, stage_name)
+            profile.dump_stats(base + '.pstats')
+            stats = pstats.Stats(profile)
+            with open(base + '.folded', 'w', encoding='utf-8') as f:
+                for stack, micros in collapsed_stacks(stats):
+                    f.write(f'{stack} {micros}\n')
+        for stage_name in self._allocations:
+            with open(os.path.join(self.run_dir, stage_name + '.alloc.txt'), 'w', encoding='utf-8') as f:
+                f.write(self._allocation_report(stage_name))
+
+        print(f"Profile for {self.name} written to {self.run_dir}")
+        return self.run_dir
+
+    def _allocation_report(self, stage_name):
+        rows = sorted(self._allocations[stage_name].items(), key=lambda item: -item[1][0])
+        lines = [f"Top {self.top} allocation sites for stage '{stage_name}' (net bytes retained)", '']
+        for (filename, lineno), (size, count) in rows[:self.top]:
+            lines.append(f"{size / 1024:10.1f} KiB {count:8} blocks  {filename}:{lineno}")
+        return '\n'.join(lines) + '\n'
+
+
+def _label(func):
+    filename, lineno, name = func
+    return f'{name} ({os.path.basename(filename)}:{lineno})' if lineno else name
+
+
+def collapsed_stacks(stats, max_depth=64):
+    """Rebuild approximate call stacks from the pstats caller graph.
+
+    cProfile only records caller -> callee edges, so time below a function
+    reached along one path is split in proportion to that path's share of
+    the function's cumulative time.
+    """
+    callees = defaultdict(dict)
+    roots = []
+    for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            callees[caller][func] = edge
+
+    output = defaultdict(int)
+
+    def walk(func, path, share, seen):
+        tt = stats.stats[func][2]
+        stack = path + [_label(func)]
+        micros = int(tt * share * 1e6)
+        if micros:
+            output[';'.join(stack)] += micros
+        if len(stack) >= max_depth:
+            return
+        for callee, edge in callees.get(func, {}).items():
+            callee_ct = stats.stats[callee][3]
+            callee_share = share * edge[3] / callee_ct if callee_ct else 0.0
+            # Paths worth less than a microsecond are dropped to keep the walk small
+            if callee in seen or callee_share * callee_ct < 1e-6:
+                continue
+            walk(callee, stack, callee_share, seen | {callee})
+
+    for root in roots:
+        walk(root, [], 1.0, {root})
+
+    return sorted(output.items())
+
+
+def _stage_stats(run_dir):
+    stages = {}
+    for name in sorted(os.listdir(run_dir)):
+        if name.endswith('.pstats'):
+            stats = pstats.Stats(os.path.join(run_dir, name))
+            stages[name[:-len('.pstats')]] = stats
+    return stages
+
+
+def compare_runs(baseline_dir, candidate_dir, top=20):
+    """Print per-stage totals and the functions whose cumulative time grew the most"""
+    baseline = _stage_stats(baseline_dir)
+    candidate = _stage_stats(candidate_dir)
+
+    print("\n" + "="*60)
+    print("PROFILE COMPARISON")
+    print("="*60)
+    print(f"Baseline : {baseline_dir}")
+    print(f"Candidate: {candidate_dir}")
+
+    for stage_name in [s for s in STAGES if s in baseline or s in candidate] + \
+            sorted((baseline.keys() | candidate.keys()) - set(STAGES)):
+        old = baseline[stage_name].stats if stage_name in baseline else {}
+        new = candidate[stage_name].stats if stage_name in candidate else {}
+        old_total = baseline[stage_name].total_tt if stage_name in baseline else 0.0
+        new_total = candidate[stage_name].total_tt if stage_name in candidate else 0.0
+
+        print("\n" + "-"*60)
+        print(f"{stage_name}: {old_total:.3f}s -> {new_total:.3f}s ({new_total - old_total:+.3f}s)")
+        print("-"*60)
+
+        deltas = []
+        for func in old.keys() | new.keys():
+            old_ct = old[func][3] if func in old else 0.0
+            new_ct = new[func][3] if func in new else 0.0
+            if new_ct > old_ct:
+                deltas.append((new_ct - old_ct, old_ct, new_ct, func))
+        deltas.sort(reverse=True)
+        if not deltas:
+            print("  no function got slower")
+        for delta, old_ct, new_ct, func in deltas[:top]:
+            print(f"  {delta:+8.3f}s  {old_ct:8.3f}s -> {new_ct:8.3f}s  {_label(func)}")
+
+    print("="*60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare two --profile run directories')
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+    compare_runs(args.baseline, args.candidate, args.top)
+
+
+if __name__ == "__main__":
+    main()
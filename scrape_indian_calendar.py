@@ -0,0 +1,242 @@
+import argparse
+import re
+import requests
+import time
+from bs4 import BeautifulSoup
+from datetime import datetime
+
+from change_feed import save_snapshot
+from hedged_fetch import HedgedFetcher, add_hedged_arguments, is_indian_calendar_page
+from page_archive import PageArchive, add_archive_argument
+from profiling import StageProfiler, add_profile_argument
+from scrape_panchang import group_by_month, print_planner
+
+URL = 'https://www.drikpanchang.com/calendars/indian/indiancalendar.html?year={}'
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+# The four containers parseIndianEvents in index.html tries, matched in one pass
+EVENT_CLASSES = ['dpEventInfo', 'dpCalendarDate', 'dpCalendarEvent', 'dpHinduEvent']
+DATE_CLASSES = ['dpEventGregDate', 'dpCalendarGregDate', 'dpDate']
+NAME_CLASSES = ['dpEventName', 'dpCalendarEventName', 'dpHinduEventName']
+
+DATE_PATTERN = re.compile(r'([A-Za-z]+)\s+(\d{1,2}),\s+(\d{4})')
+# Upper bound on page text examined by the fallback scan
+MAX_SCAN_CHARS = 2_000_000
+
+
+def fetch_page(year=2025, fetcher=None):
+    """Download the raw Indian calendar page for a year"""
+    if fetcher:
+        return fetcher.fetch(URL.format(year))
+    response = requests.get(URL.format(year), headers=HEADERS, timeout=30)
+    response.raise_for_status()
+    return response.content
+
+
+def normalize_date(text):
+    """'January 14, 2026' (with or without weekday) -> datetime, or None"""
+    match = DATE_PATTERN.search(text)
+    if not match:
+        return None
+    month, day, year = match.groups()
+    for fmt in ('%B %d %Y', '%b %d %Y'):
+        try:
+            return datetime.strptime(f'{month} {day} {year}', fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _fallback_lines(soup):
+    """Each line of page text once, capped at MAX_SCAN_CHARS in total"""
+    budget = MAX_SCAN_CHARS
+    for text in soup.find_all(string=True):
+        if text.parent.name in ('script', 'style'):
+            continue
+        for line in text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            budget -= len(line)
+            if budget < 0:
+                return
+            yield line
+
+
+def extract_events(html_content, verbose=True):
+    """Normalized, deduplicated events from an Indian calendar page, sorted by date"""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    found = []
+
+    for element in soup.find_all(class_=EVENT_CLASSES):
+        date_element = element.find(class_=DATE_CLASSES)
+        name_element = element.find(class_=NAME_CLASSES)
+        if date_element and name_element:
+            found.append((date_element.get_text(strip=True), name_element.get_text(' ', strip=True)))
+            continue
+        # Same fallback as the browser: "<Month D>, <YYYY>, <name...>"
+        parts = element.get_text(strip=True).split(',')
+        if len(parts) >= 3:
+            found.append((parts[0] + ',' + parts[1], ','.join(parts[2:]).strip()))
+
+    if not found:
+        # No known containers: scan the text lines once instead of every element's full text
+        pending_date = None
+        for line in _fallback_lines(soup):
+            match = DATE_PATTERN.search(line)
+            if match:
+                remaining = (line[:match.start()] + line[match.end():]).strip(' ,-:')
+                if len(remaining) > 3:
+                    found.append((match.group(0), remaining))
+                    pending_date = None
+                else:
+                    pending_date = match.group(0)
+            elif pending_date and len(line) > 3:
+                found.append((pending_date, line))
+                pending_date = None
+
+    events = []
+    seen = set()
+    for date_text, name in found:
+        date_obj = normalize_date(date_text)
+        name = re.sub(r'\s+', ' ', name).strip()
+        if not date_obj or not name:
+            continue
+        key = (date_obj, name.lower())
+        if key in seen:
+            continue
+        seen.add(key)
+        events.append((date_obj, name))
+
+    events.sort(key=lambda event: event[0])
+    if verbose:
+        print(f"Found {len(events)} unique events")
+    return [{'date': date_obj.strftime('%B %d, %Y, %A'), 'name': name} for date_obj, name in events]
+
+
+def save_to_json(events, filename):
+    """Save the extracted events to a JSON snapshot"""
+    save_snapshot(filename, events)
+    print(f"Data saved to {filename}")
+
+
+def legacy_extract_events(html_content):
+    """Line-for-line port of parseIndianEvents from index.html, kept for the benchmark"""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    events = []
+    for selector in ['.dpEventInfo', '.dpCalendarDate', '.dpCalendarEvent', '.dpHinduEvent']:
+        for element in soup.select(selector):
+            date = name = ''
+            date_element = element.select_one('.dpEventGregDate, .dpCalendarGregDate, .dpDate')
+            name_element = element.select_one('.dpEventName, .dpCalendarEventName, .dpHinduEventName')
+            if date_element and name_element:
+                date = date_element.get_text().strip()
+                name = name_element.get_text().strip()
+            elif ',' in element.get_text():
+                parts = element.get_text().strip().split(',')
+                if len(parts) >= 2:
+                    date = parts[0] + ',' + parts[1]
+                    name = ','.join(parts[2:]).strip()
+            if date and name and not any(e['date'] == date and e['name'] == name for e in events):
+                events.append({'date': date, 'name': name})
+
+    if not events:
+        for element in soup.find_all(True):
+            text = element.get_text()
+            if text and re.search(r'\w+\s+\d{1,2},\s+\d{4}', text):
+                for date in re.findall(r'(\w+\s+\d{1,2},\s+\d{4})', text):
+                    remaining = text.replace(date, '', 1).strip()
+                    if remaining and len(remaining) > 3:
+                        events.append({'date': date.strip(), 'name': remaining})
+    return events
+
+
+def make_fixture(events=600, nested=True, known_markup=True, depth=1):
+    """Synthetic Indian calendar page; ``known_markup=False`` forces the text fallback"""
+    months = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+              'August', 'September', 'October', 'November', 'December']
+    blocks = []
+    for i in range(events):
+        date = f'{months[i % 12]} {i % 28 + 1}, 2026'
+        name = f'Festival {i % (events // 2 or 1)}'
+        if known_markup:
+            inner = f'<div class="dpHinduEvent"><span class="dpHinduEventName">{name}</span></div>' if nested else ''
+            blocks.append(f'<div class="dpEventInfo"><div class="dpEventGregDate">{date}, Monday</div>'
+                          f'<div class="dpEventName">{name}</div>{inner}</div>')
+        else:
+            blocks.append(f'<li><span>{date}</span> <b>{name}</b></li>')
+    body = ''.join(blocks)
+    for _ in range(depth):
+        body = f'<div class="wrapper">{body}</div>'
+    return f'<html><head><script>var x = "June 1, 2026";</script></head><body>{body}</body></html>'.encode('utf-8')
+
+
+def benchmark(fixture_path=None, repeat=3):
+    """Compare extract_events with the index.html approach on the same fixtures"""
+    if fixture_path:
+        with open(fixture_path, 'rb') as f:
+            fixtures = {fixture_path: f.read()}
+    else:
+        fixtures = {
+            'dpEventInfo markup, 600 events': make_fixture(600),
+            'dpEventInfo markup, 2400 events': make_fixture(2400),
+            'text fallback, 300 events, depth 40': make_fixture(300, known_markup=False, depth=40),
+            'text fallback, 300 events, depth 160': make_fixture(300, known_markup=False, depth=160),
+        }
+
+    print("\n" + "="*72)
+    print("INDIAN CALENDAR PARSER BENCHMARK")
+    print("="*72)
+    for label, html in fixtures.items():
+        timings = {}
+        counts = {}
+        for name, parse in (('current', legacy_extract_events),
+                            ('new', lambda page: extract_events(page, verbose=False))):
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                result = parse(html)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[name] = best
+            counts[name] = len(result)
+        print(f"{label:38} current {timings['current'] * 1000:8.1f} ms ({counts['current']:5} events)  "
+              f"new {timings['new'] * 1000:7.1f} ms ({counts['new']:5} events)  "
+              f"{timings['current'] / timings['new']:5.1f}x")
+    print("="*72)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Scrape the Drik Panchang Indian calendar')
+    parser.add_argument('--year', type=int, default=2025)
+    parser.add_argument('--benchmark', nargs='?', const='', metavar='FIXTURE',
+                        help='Benchmark against the index.html parser (optionally on a saved page)')
+    add_profile_argument(parser)
+    add_hedged_arguments(parser)
+    add_archive_argument(parser)
+    args = parser.parse_args()
+
+    if args.benchmark is not None:
+        benchmark(args.benchmark or None)
+    else:
+        profiler = StageProfiler('scrape_indian_calendar', args.profile, mode=args.profile_mode)
+
+        with profiler.stage('fetch'):
+            fetcher = HedgedFetcher(validate=is_indian_calendar_page, stats_file=args.route_stats) if args.hedged else None
+            html_content = fetch_page(args.year, fetcher)
+        if args.archive:
+            PageArchive(args.archive).add('indiancalendar', html_content, args.year)
+
+        with profiler.stage('parse'):
+            events = extract_events(html_content)
+
+        with profiler.stage('clean'):
+            monthly_events = group_by_month(events)
+
+        with profiler.stage('save'):
+            save_to_json(events, f'indian_calendar_{args.year}.json')
+
+        with profiler.stage('report'):
+            print_planner(monthly_events)
+
+        profiler.finish()
@@ -4,16 +4,20 @@ Indian National Days Scraper
 Scrapes important days from Career Power website for all months
 """
 
+import argparse
 import requests
 from bs4 import BeautifulSoup
 import csv
-import json
 import time
 from datetime import datetime
 import re
 
+from change_feed import save_snapshot
+from page_archive import PageArchive, add_archive_argument
+from profiling import StageProfiler, add_profile_argument
+
 class IndianNationalDaysScraper:
-    def __init__(self):
+    def __init__(self, profiler=None, archive=None):
         self.base_url = "https://www.careerpower.in/blog/important-days-in-{}"
         self.months = [
             'january', 'february', 'march', 'april', 'may', 'june',
@@ -23,68 +27,88 @@ class IndianNationalDaysScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         self.all_events = {}
+        self.profiler = profiler or StageProfiler('scrape_indian_national_days')
+        self.archive = archive
         
-    def scrape_month(self, month):
-        """Scrape events for a specific month"""
+    def fetch_month(self, month):
+        """Download the raw page for a specific month"""
         url = self.base_url.format(month)
-        print(f"Scraping {month.capitalize()}...")
+        response = requests.get(url, headers=self.headers, timeout=30)
+        response.raise_for_status()
+        return response.content
+    
+    @staticmethod
+    def parse_month(content, month):
+        """Extract events for a month from its raw page content"""
+        soup = BeautifulSoup(content, 'html.parser')
+        events = []
         
-        try:
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            events = []
-            
-            # Find the table with events
-            tables = soup.find_all('table')
+        # Find the table with events
+        tables = soup.find_all('table')
+        
+        for table in tables:
+            rows = table.find_all('tr')
             
-            for table in tables:
-                rows = table.find_all('tr')
-                
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) >= 2:
-                        date_cell = cells[0].get_text(strip=True)
-                        event_cell = cells[1].get_text(separator=' ', strip=True)
+            for row in rows:
+                cells = row.find_all('td')
+                if len(cells) >= 2:
+                    date_cell = cells[0].get_text(strip=True)
+                    event_cell = cells[1].get_text(separator=' ', strip=True)
+                    
+                    # Skip header rows
+                    if 'Dates' in date_cell or 'Days' in date_cell:
+                        continue
                         
-                        # Skip header rows
-                        if 'Dates' in date_cell or 'Days' in date_cell:
-                            continue
-                            
-                        # Clean up the date and event text
-                        if date_cell and event_cell and any(char.isdigit() for char in date_cell):
-                            # Handle multiple events in one cell (separated by line breaks)
-                            event_parts = event_cell.replace('\n', ' ').split('  ')
-                            event_parts = [part.strip() for part in event_parts if part.strip()]
-                            
-                            for event_part in event_parts:
-                                if event_part and len(event_part) > 3:  # Filter out very short strings
-                                    events.append({
-                                        'date': date_cell,
-                                        'event': event_part,
-                                        'month': month.capitalize()
-                                    })
-            
-            # Also try to find events in paragraph format
-            paragraphs = soup.find_all(['p', 'h3', 'h4'])
-            for para in paragraphs:
-                text = para.get_text(strip=True)
-                # Look for patterns like "World Braille Day- 4th January 2025"
-                if re.search(r'\d{1,2}(st|nd|rd|th)\s+' + month, text, re.IGNORECASE):
-                    # Extract event name and date
-                    match = re.search(r'(.+?)-\s*(\d{1,2}(st|nd|rd|th)\s+' + month + r')', text, re.IGNORECASE)
-                    if match:
-                        event_name = match.group(1).strip()
-                        date_str = match.group(2).strip()
+                    # Clean up the date and event text
+                    if date_cell and event_cell and any(char.isdigit() for char in date_cell):
+                        # Handle multiple events in one cell (separated by line breaks)
+                        event_parts = event_cell.replace('\n', ' ').split('  ')
+                        event_parts = [part.strip() for part in event_parts if part.strip()]
                         
-                        if event_name and len(event_name) > 3:
-                            events.append({
-                                'date': date_str,
-                                'event': event_name,
-                                'month': month.capitalize()
-                            })
-            
+                        for event_part in event_parts:
+                            if event_part and len(event_part) > 3:  # Filter out very short strings
+                                events.append({
+                                    'date': date_cell,
+                                    'event': event_part,
+                                    'month': month.capitalize()
+                                })
+        
+        # Also try to find events in paragraph format
+        paragraphs = soup.find_all(['p', 'h3', 'h4'])
+        for para in paragraphs:
+            text = para.get_text(strip=True)
+            # Look for patterns like "World Braille Day- 4th January 2025"
+            if re.search(r'\d{1,2}(st|nd|rd|th)\s+' + month, text, re.IGNORECASE):
+                # Extract event name and date
+                match = re.search(r'(.+?)-\s*(\d{1,2}(st|nd|rd|th)\s+' + month + r')', text, re.IGNORECASE)
+                if match:
+                    event_name = match.group(1).strip()
+                    date_str = match.group(2).strip()
+                    
+                    if event_name and len(event_name) > 3:
+                        events.append({
+                            'date': date_str,
+                            'event': event_name,
+                            'month': month.capitalize()
+                        })
+        
+        return events
+    
+    def scrape_month(self, month):
+        """Scrape events for a specific month"""
+        print(f"Scraping {month.capitalize()}...")
+        
+        try:
+            with self.profiler.stage('fetch'):
+                content = self.fetch_month(month)
+            if self.archive:
+                try:
+                    self.archive.add('careerpower', content, month=month)
+                except Exception as e:
+                    # The archive is a side copy; the fetched month is still parsed
+                    print(f"Warning: could not archive {month}: {e}")
+            with self.profiler.stage('parse'):
+                events = self.parse_month(content, month)
             print(f"Found {len(events)} events for {month.capitalize()}")
             return events
             
@@ -149,8 +173,7 @@ class IndianNationalDaysScraper:
     
     def save_to_json(self, filename='indian_national_days.json'):
         """Save events to JSON file"""
-        with open(filename, 'w', encoding='utf-8') as jsonfile:
-            json.dump(self.all_events, jsonfile, indent=2, ensure_ascii=False)
+        save_snapshot(filename, self.all_events)
         
         print(f"Data saved to {filename}")
     
@@ -337,7 +360,12 @@ class IndianNationalDaysScraper:
         print("="*60)
 
 def main():
-    scraper = IndianNationalDaysScraper()
+    parser = argparse.ArgumentParser(description='Scrape Indian national days from Career Power')
+    add_profile_argument(parser)
+    add_archive_argument(parser)
+    args = parser.parse_args()
+    profiler = StageProfiler('scrape_indian_national_days', args.profile, mode=args.profile_mode)
+    scraper = IndianNationalDaysScraper(profiler, PageArchive(args.archive) if args.archive else None)
     
     print("🇮🇳 Indian National Days Scraper")
     print("=" * 50)
@@ -349,16 +377,22 @@ def main():
     
     # Clean and deduplicate
     print("\nCleaning and deduplicating data...")
-    scraper.clean_and_deduplicate()
+    with profiler.stage('clean'):
+        scraper.clean_and_deduplicate()
     
     # Print summary
-    scraper.print_summary()
+    with profiler.stage('report'):
+        scraper.print_summary()
     
     # Save to different formats
     print("\nSaving data to files...")
-    scraper.save_to_csv()
-    scraper.save_to_json()
-    scraper.generate_html_report()
+    with profiler.stage('save'):
+        scraper.save_to_csv()
+        scraper.save_to_json()
+    with profiler.stage('report'):
+        scraper.generate_html_report()
+    
+    profiler.finish()
     
     print("\n✅ Scraping completed successfully!")
     print("\nGenerated files:")
@@ -1,67 +1,94 @@
+import argparse
 import requests
 from bs4 import BeautifulSoup
+from collections import defaultdict
+from datetime import datetime
 
-# Scrape the website
-url = 'https://www.drikpanchang.com/iskcon/iskcon-event-calendar.html?year=2025'
-headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-response = requests.get(url, headers=headers)
-html_content = response.text
+from change_feed import save_snapshot
+from hedged_fetch import HedgedFetcher, add_hedged_arguments, is_drik_panchang_page
+from page_archive import PageArchive, add_archive_argument
+from profiling import StageProfiler, add_profile_argument
 
-# Parse HTML
-soup = BeautifulSoup(html_content, 'html.parser')
+URL = 'https://www.drikpanchang.com/iskcon/iskcon-event-calendar.html?year={}'
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
 
-# Find all elements with class dpEventInfo
-event_infos = soup.find_all('div', class_='dpEventInfo')
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+MONTH_DAYS = {'Jan': 31, 'Feb': 28, 'Mar': 31, 'Apr': 30, 'May': 31, 'Jun': 30,
+              'Jul': 31, 'Aug': 31, 'Sep': 30, 'Oct': 31, 'Nov': 30, 'Dec': 31}
 
-from collections import defaultdict
-from datetime import datetime
 
-# Extract data
-events = []
-print(f"Found {len(event_infos)} event_infos")
-
-for event_info in event_infos:
-    greg_date = event_info.find('div', class_='dpEventGregDate')
-    event_name = event_info.find('div', class_='dpEventName dpHinduEventColor')
-    
-    if greg_date and event_name:
-        date_text = greg_date.get_text(strip=True)
-        name_text = event_name.get_text(strip=True)
-        print(f"Found event: {date_text} - {name_text}")
-        events.append({
-            'date': date_text,
-            'name': name_text
-        })
-
-print(f"Total events extracted: {len(events)}")
-
-# Group by month and date
-monthly_events = defaultdict(lambda: defaultdict(list))
-for event in events:
-    try:
-        # Parse format like "December 17, 2025, Wednesday"
-        date_part = event['date'].split(',')[0] + ', ' + event['date'].split(',')[1].strip()
-        date_obj = datetime.strptime(date_part, '%B %d, %Y')
-        month = date_obj.strftime('%b')
-        day = date_obj.day
-        monthly_events[month][day].append(event['name'])
-    except Exception as e:
-        print(f"Date parsing error for '{event['date']}': {e}")
-        continue
-
-print(f"Months found: {list(monthly_events.keys())}")
-
-# Print formatted results
-if not monthly_events:
-    print("No events found to display")
-else:
-    month_days = {'Jan': 31, 'Feb': 28, 'Mar': 31, 'Apr': 30, 'May': 31, 'Jun': 30,
-                  'Jul': 31, 'Aug': 31, 'Sep': 30, 'Oct': 31, 'Nov': 30, 'Dec': 31}
-    
-    for month in ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']:
+def fetch_page(year=2025, location=None, fetcher=None):
+    """Download the raw ISKCON calendar page for a year, optionally for a geoname id"""
+    url = URL.format(year)
+    if location:
+        url += f'&geoname-id={location}'
+    if fetcher:
+        return fetcher.fetch(url)
+    response = requests.get(url, headers=HEADERS, timeout=30)
+    response.raise_for_status()
+    return response.content
+
+
+def extract_events(html_content, verbose=True):
+    """Pull (date, name) pairs out of the dpEventInfo blocks of a calendar page"""
+    soup = BeautifulSoup(html_content, 'html.parser')
+
+    # Find all elements with class dpEventInfo
+    event_infos = soup.find_all('div', class_='dpEventInfo')
+    if verbose:
+        print(f"Found {len(event_infos)} event_infos")
+
+    events = []
+    for event_info in event_infos:
+        greg_date = event_info.find('div', class_='dpEventGregDate')
+        event_name = event_info.find('div', class_='dpEventName dpHinduEventColor')
+
+        if greg_date and event_name:
+            date_text = greg_date.get_text(strip=True)
+            name_text = event_name.get_text(strip=True)
+            if verbose:
+                print(f"Found event: {date_text} - {name_text}")
+            events.append({
+                'date': date_text,
+                'name': name_text
+            })
+
+    return events
+
+
+def group_by_month(events):
+    """Group events by month abbreviation and day of month"""
+    monthly_events = defaultdict(lambda: defaultdict(list))
+    for event in events:
+        try:
+            # Parse format like "December 17, 2025, Wednesday"
+            date_part = event['date'].split(',')[0] + ', ' + event['date'].split(',')[1].strip()
+            date_obj = datetime.strptime(date_part, '%B %d, %Y')
+            month = date_obj.strftime('%b')
+            day = date_obj.day
+            monthly_events[month][day].append(event['name'])
+        except Exception as e:
+            print(f"Date parsing error for '{event['date']}': {e}")
+            continue
+    return monthly_events
+
+
+def save_to_json(events, filename):
+    """Save the extracted events to a JSON snapshot"""
+    save_snapshot(filename, events)
+    print(f"Data saved to {filename}")
+
+
+def print_planner(monthly_events):
+    """Print the monthly planner text"""
+    if not monthly_events:
+        print("No events found to display")
+        return
+
+    for month in MONTHS:
         if month in monthly_events:
             print(f"{month} Planner\n")
-            for day in range(1, month_days[month] + 1):
+            for day in range(1, MONTH_DAYS[month] + 1):
                 if day in monthly_events[month]:
                     event_names = monthly_events[month][day]
                     if len(event_names) == 1:
@@ -72,4 +99,36 @@ else:
                             print(f"   {name}")
                 else:
                     print(f"{day}.")
-            print()
\ No newline at end of file
+            print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Scrape the ISKCON event calendar from Drik Panchang')
+    parser.add_argument('--year', type=int, default=2025)
+    add_profile_argument(parser)
+    add_hedged_arguments(parser)
+    add_archive_argument(parser)
+    args = parser.parse_args()
+    profiler = StageProfiler('scrape_panchang', args.profile, mode=args.profile_mode)
+
+    with profiler.stage('fetch'):
+        fetcher = HedgedFetcher(validate=is_drik_panchang_page, stats_file=args.route_stats) if args.hedged else None
+        html_content = fetch_page(args.year, None, fetcher)
+    if args.archive:
+        PageArchive(args.archive).add('drikpanchang', html_content, args.year)
+
+    with profiler.stage('parse'):
+        events = extract_events(html_content)
+    print(f"Total events extracted: {len(events)}")
+
+    with profiler.stage('clean'):
+        monthly_events = group_by_month(events)
+    print(f"Months found: {list(monthly_events.keys())}")
+
+    with profiler.stage('save'):
+        save_to_json(events, f'iskcon_events_{args.year}.json')
+
+    with profiler.stage('report'):
+        print_planner(monthly_events)
+
+    profiler.finish()
@@ -1,82 +1,101 @@
+import argparse
 import requests
 from bs4 import BeautifulSoup
 from collections import defaultdict
 import re
 
-def scrape_un_days():
-    url = 'https://www.un.org/en/observances/list-days-weeks'
+from change_feed import save_snapshot
+from page_archive import PageArchive, add_archive_argument
+from profiling import StageProfiler, add_profile_argument
+
+UN_URL = 'https://www.un.org/en/observances/list-days-weeks'
+
+def fetch_un_page(url=None):
+    """Download the raw UN observances list, as the bytes the server sent"""
     headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    response = requests.get(url or UN_URL, headers=headers)
+    response.raise_for_status()
+    return response.content
+
+def parse_un_page(html, verbose=True):
+    """Extract events from the UN observances list (bytes or text), grouped by month number"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Find all event rows
+    events_by_month = defaultdict(list)
     
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find all event rows
-        events_by_month = defaultdict(list)
-        
-        # Look for the main content area
-        rows = soup.find_all('div', class_='views-row')
-        
+    # Look for the main content area
+    rows = soup.find_all('div', class_='views-row')
+    
+    if verbose:
         print(f"Found {len(rows)} event rows")
-        
-        for row in rows:
+    
+    for row in rows:
+        try:
+            # Find title
+            title_elem = row.find('span', class_='views-field-title')
+            if not title_elem:
+                continue
+                
+            title_link = title_elem.find('a')
+            if not title_link:
+                continue
+                
+            event_name = title_link.get_text(strip=True)
+            
+            # Find date
+            date_elem = row.find('div', class_='views-field-field-event-date-1')
+            if not date_elem:
+                continue
+                
+            date_span = date_elem.find('span', class_='date-display-single')
+            if not date_span:
+                continue
+                
+            date_text = date_span.get_text(strip=True)
+            
+            # Parse date to get month
             try:
-                # Find title
-                title_elem = row.find('span', class_='views-field-title')
-                if not title_elem:
-                    continue
-                    
-                title_link = title_elem.find('a')
-                if not title_link:
-                    continue
-                    
-                event_name = title_link.get_text(strip=True)
+                # Date format is like "04 Jun" or "27 Jan"
+                day, month_abbr = date_text.split()
                 
-                # Find date
-                date_elem = row.find('div', class_='views-field-field-event-date-1')
-                if not date_elem:
-                    continue
-                    
-                date_span = date_elem.find('span', class_='date-display-single')
-                if not date_span:
-                    continue
-                    
-                date_text = date_span.get_text(strip=True)
+                month_map = {
+                    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+                    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+                }
                 
-                # Parse date to get month
-                try:
-                    # Date format is like "04 Jun" or "27 Jan"
-                    day, month_abbr = date_text.split()
-                    
-                    month_map = {
-                        'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-                        'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
-                    }
-                    
-                    month_num = month_map.get(month_abbr)
-                    if month_num:
-                        events_by_month[month_num].append({
-                            'date': date_text,
-                            'name': event_name
-                        })
+                month_num = month_map.get(month_abbr)
+                if month_num:
+                    events_by_month[month_num].append({
+                        'date': date_text,
+                        'name': event_name
+                    })
+                    if verbose:
                         print(f"Added: {date_text} - {event_name}")
-                        
-                except ValueError:
-                    print(f"Could not parse date: {date_text}")
-                    continue
                     
-            except Exception as e:
-                print(f"Error processing row: {e}")
+            except ValueError:
+                print(f"Could not parse date: {date_text}")
                 continue
-        
-        return events_by_month
-        
+                
+        except Exception as e:
+            print(f"Error processing row: {e}")
+            continue
+    
+    return events_by_month
+
+def scrape_un_days(url=None):
+    try:
+        return parse_un_page(fetch_un_page(url))
     except Exception as e:
         print(f"Error scraping UN days: {e}")
         return {}
 
+def save_to_json(events_by_month, filename='un_days.json'):
+    """Save events to JSON file keyed by month number"""
+    data = {str(month_num): events_by_month[month_num] for month_num in sorted(events_by_month)}
+    save_snapshot(filename, data)
+    print(f"Data saved to {filename}")
+
 def format_for_javascript(events_by_month):
     """Format the data for JavaScript object"""
     
@@ -138,11 +157,34 @@ def print_summary(events_by_month):
     print(f"\nTotal events found: {total_events}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Scrape UN international days')
+    add_profile_argument(parser)
+    add_archive_argument(parser)
+    args = parser.parse_args()
+    profiler = StageProfiler('scrape_un_days', args.profile, mode=args.profile_mode)
+    
     print("Scraping UN International Days...")
-    events = scrape_un_days()
+    events = {}
+    try:
+        with profiler.stage('fetch'):
+            html = fetch_un_page()
+        if args.archive:
+            try:
+                PageArchive(args.archive).add('un', html)
+            except Exception as e:
+                print(f"Warning: could not archive the UN page: {e}")
+        with profiler.stage('parse'):
+            events = parse_un_page(html)
+    except Exception as e:
+        print(f"Error scraping UN days: {e}")
     
     if events:
-        print_summary(events)
-        format_for_javascript(events)
+        with profiler.stage('report'):
+            print_summary(events)
+            format_for_javascript(events)
+        with profiler.stage('save'):
+            save_to_json(events)
     else:
-        print("No events found or error occurred")
\ No newline at end of file
+        print("No events found or error occurred")
+    
+    profiler.finish()
\ No newline at end of file
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+ISKCON Maharaj Days Watcher
+Watches swamisiskcon.csv and, on each saved edit, re-parses only the rows whose
+hash changed and regenerates only the affected months of the JSON and HTML report
+"""
+
+import argparse
+import csv
+import hashlib
+import os
+import time
+from collections import Counter
+
+from process_iskcon_maharaj_days import (
+    CHUNK_BYTES, EVENT_TYPES, MONTH_KEYS, month_events, parse_event_slot,
+    render_month_section, save_to_json, write_html_report
+)
+
+
+class MaharajDaysWatcher:
+    def __init__(self, csv_file='swamisiskcon.csv', json_file='iskcon_maharaj_days.json',
+                 html_file='iskcon_maharaj_days.html'):
+        self.csv_file = csv_file
+        self.json_file = json_file
+        self.html_file = html_file
+        self.columns = None
+        self.row_hashes = []
+        self.row_events = {}
+        self.parsed_dates = {}
+        self.data = {month: [] for month in MONTH_KEYS}
+        self.sections = {}
+        # Months whose last write failed; rewritten on the next refresh even if their rows went back
+        self.unwritten = set()
+
+    def _read_rows(self):
+        """Yield (hash, row) for every data row of the CSV"""
+        with open(self.csv_file, 'r', encoding='utf-8', newline='', buffering=CHUNK_BYTES) as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, [])
+            try:
+                columns = [header.index('Maharaj'), header.index('App'), header.index('Disapp')]
+            except ValueError:
+                # Usually a save in progress; raising keeps the last good output untouched
+                raise ValueError(f"{self.csv_file} is missing a Maharaj, App or Disapp column")
+            if columns != self.columns:
+                # Cached rows were parsed with the old layout: start over with a full rebuild
+                self.columns = columns
+                self.row_hashes = []
+                self.row_events = {}
+                self.sections = {}
+            for row in reader:
+                digest = hashlib.blake2b('\x1f'.join(row).encode('utf-8'), digest_size=16).digest()
+                yield digest, row
+
+    def _parse_row(self, row):
+        """(month_index, day, name, type) for each date in one row"""
+        name_col, app_col, dis_col = self.columns
+        if len(row) <= max(self.columns):
+            return ()
+        maharaj_name = row[name_col].strip()
+        if not maharaj_name:
+            return ()
+        events = []
+        for date_col, (event_type, _) in zip((app_col, dis_col), EVENT_TYPES):
+            slot = parse_event_slot(row[date_col].strip(), self.parsed_dates)
+            if slot:
+                events.append((slot[0], slot[1], maharaj_name, event_type))
+        return tuple(events)
+
+    def refresh(self):
+        """Bring the JSON and HTML up to date with the CSV; returns timing details"""
+        timings = {}
+        start = time.perf_counter()
+
+        new_hashes = []
+        parsed_rows = 0
+        for digest, row in self._read_rows():
+            new_hashes.append(digest)
+            if digest not in self.row_events:
+                self.row_events[digest] = self._parse_row(row)
+                parsed_rows += 1
+        timings['hash'] = time.perf_counter() - start
+
+        old_counts = Counter(self.row_hashes)
+        new_counts = Counter(new_hashes)
+        changed = (old_counts - new_counts) + (new_counts - old_counts)
+        affected = {event[0] for digest in changed for event in self.row_events[digest]}
+        first_run = not self.sections
+
+        if first_run:
+            affected = set(range(12))
+        affected |= self.unwritten
+
+        # Rebuild affected months from cached row events, in CSV order
+        mark = time.perf_counter()
+        day_slots = {month_index: [[] for _ in range(32)] for month_index in affected}
+        if affected:
+            for digest in new_hashes:
+                for month_index, day, maharaj_name, event_type in self.row_events[digest]:
+                    if month_index in day_slots:
+                        day_slots[month_index][day].append((maharaj_name, event_type))
+        for month_index, slots in day_slots.items():
+            month = MONTH_KEYS[month_index]
+            self.data[month] = month_events(month_index, slots)
+            self.sections[month] = render_month_section(month, self.data[month])
+        timings['patch'] = time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        self.unwritten = affected
+        if affected:
+            save_to_json(self.data, self.json_file)
+            write_html_report(self.sections, self.html_file)
+        timings['write'] = time.perf_counter() - mark
+
+        # Only forget the old rows once the output reflects the new ones
+        self.unwritten = set()
+        for digest in old_counts.keys() - new_counts.keys():
+            del self.row_events[digest]
+        self.row_hashes = new_hashes
+        timings['total'] = time.perf_counter() - start
+
+        return {
+            'changed_rows': sum(changed.values()),
+            'parsed_rows': parsed_rows,
+            'months': sorted(MONTH_KEYS[month_index] for month_index in affected),
+            'timings': timings
+        }
+
+    def _signature(self):
+        try:
+            stat = os.stat(self.csv_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _safe_refresh(self):
+        try:
+            self.report(self.refresh())
+        except Exception as e:
+            print(f"Could not regenerate from {self.csv_file}: {e}; keeping the last good output")
+
+    def watch(self, interval=0.5, debounce=1.0):
+        """Poll the CSV and regenerate once it has been quiet for ``debounce`` seconds"""
+        print(f"Watching {self.csv_file} (Ctrl+C to stop)")
+        self._safe_refresh()
+        last_signature = self._signature()
+        try:
+            while True:
+                time.sleep(interval)
+                signature = self._signature()
+                if signature == last_signature:
+                    continue
+
+                # Wait for the editor to finish writing
+                quiet_since = time.monotonic()
+                while time.monotonic() - quiet_since < debounce:
+                    time.sleep(interval)
+                    latest = self._signature()
+                    if latest != signature:
+                        signature = latest
+                        quiet_since = time.monotonic()
+
+                last_signature = signature
+                if signature is None:
+                    print(f"{self.csv_file} was removed, waiting for it to come back")
+                    continue
+                self._safe_refresh()
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+
+    @staticmethod
+    def report(result):
+        timings = result['timings']
+        months = ', '.join(month.capitalize() for month in result['months']) or 'none'
+        print(f"{result['changed_rows']} changed rows, {result['parsed_rows']} parsed, months: {months}")
+        print(f"Regenerated in {timings['total'] * 1000:.1f} ms "
+              f"(hash {timings['hash'] * 1000:.1f}, patch {timings['patch'] * 1000:.1f}, "
+              f"write {timings['write'] * 1000:.1f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Regenerate Maharaj days incrementally as the CSV changes')
+    parser.add_argument('--input', default='swamisiskcon.csv')
+    parser.add_argument('--interval', type=float, default=0.5, help='Polling interval in seconds')
+    parser.add_argument('--debounce', type=float, default=1.0, help='Quiet time before regenerating')
+    args = parser.parse_args()
+
+    MaharajDaysWatcher(args.input).watch(args.interval, args.debounce)
+
+
+if __name__ == "__main__":
+    main()